@@ -1,14 +1,15 @@
 """DWD Rain Radar integration."""
 
+import importlib
 import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.httpx_client import get_async_client
+from homeassistant.helpers.storage import Store
 from homeassistant.core import HomeAssistant
 
-from .coordinator import DwdRainRadarUpdateCoordinator
 from .const import (
-    DOMAIN, PLATFORMS,
+    DOMAIN, PLATFORMS, CONF_BACKGROUND_REFRESH, STORAGE_KEY, STORAGE_VERSION,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -16,9 +17,24 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up DWD Rain Radar from a config entry."""
-    coordinator = DwdRainRadarUpdateCoordinator(hass, entry, get_async_client(hass))
 
-    await coordinator.async_config_entry_first_refresh()
+    # The coordinator pulls in numpy and the decoder, import it without blocking the event loop
+    coordinator_module = await hass.async_add_executor_job(
+        importlib.import_module, f"{__name__}.coordinator"
+    )
+    coordinator = coordinator_module.DwdRainRadarUpdateCoordinator(hass, entry, get_async_client(hass))
+
+    # Also release the location when the first refresh fails and setup is retried
+    entry.async_on_unload(coordinator.unregister)
+
+    if entry.options.get(CONF_BACKGROUND_REFRESH, False):
+        # Set up the platforms from the last stored forecasts and download in the background
+        await coordinator.async_load_cache()
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.title}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
@@ -42,3 +58,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return unload
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored forecasts of a config entry."""
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)).async_remove()
+
@@ -16,12 +16,12 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription
 )
 
-from .const import DOMAIN, ATTRIBUTION, FORECAST_MINUTES
+from .const import DOMAIN, ATTRIBUTION, CONF_EXTRAPOLATION, CONF_STATISTICS, FORECAST_MINUTES, EXTRAPOLATION_MINUTES
 from homeassistant.const import (
     ATTR_ATTRIBUTION
 )
-from .coordinator import DwdRainRadarUpdateCoordinator, PrecipitationForecast
-from .entity import DwdCoordinatorEntity
+from .coordinator import DwdRainRadarUpdateCoordinator, PrecipitationSeries
+from .entity import DwdCoordinatorEntity, VOLATILE_ATTRIBUTES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,8 +30,8 @@ _LOGGER = logging.getLogger(__name__)
 class BinarySensorEntityDescription(BinarySensorEntityDescription):
     """Provide a description for a precipitation sensor."""
 
-    is_on_fn: Callable[[PrecipitationForecast]]
-    extra_state_attributes_fn: Callable[[PrecipitationForecast], dict] = lambda _: {}
+    is_on_fn: Callable[[PrecipitationSeries]]
+    extra_state_attributes_fn: Callable[[PrecipitationSeries], dict] = lambda _: {}
     exists_fn: Callable[[dict], bool] = lambda _: True
 
 
@@ -41,14 +41,14 @@ PRECIPTITATION_SENSORS = [
         name="Raining",
         device_class=BinarySensorDeviceClass.MOISTURE,
         is_on_fn=lambda forecasts: next(
-            (forecast.precipitation > 0 for forecast in forecasts if
-             forecast.prediction_time > datetime.now().astimezone() - timedelta(minutes=5)),
+            ((forecast.precipitation or 0) > 0 for forecast in
+             forecasts.after(datetime.now().astimezone() - timedelta(minutes=5))),
             None
         ),
         extra_state_attributes_fn=lambda forecasts: {
             'prediction_time': next(
-                (forecast.prediction_time for forecast in forecasts if
-                 forecast.prediction_time > datetime.now().astimezone() - timedelta(minutes=5)),
+                (forecast.prediction_time for forecast in
+                 forecasts.after(datetime.now().astimezone() - timedelta(minutes=5))),
                 None
             )
         },
@@ -59,18 +59,21 @@ PRECIPTITATION_SENSORS = [
         entity_registry_enabled_default=False,
         device_class=BinarySensorDeviceClass.MOISTURE,
         is_on_fn=lambda forecasts, forecast_in=forecast_in: next(
-            (forecast.precipitation > 0 for forecast in forecasts if
-             forecast.prediction_time > datetime.now().astimezone() + timedelta(minutes=forecast_in - 5)),
+            ((forecast.precipitation or 0) > 0 for forecast in
+             forecasts.after(datetime.now().astimezone() + timedelta(minutes=forecast_in - 5))),
             None
         ),
         extra_state_attributes_fn=lambda forecasts, forecast_in=forecast_in: {
             'prediction_time': next(
-                (forecast.prediction_time for forecast in forecasts if
-                 forecast.prediction_time > datetime.now().astimezone() + timedelta(minutes=forecast_in - 5)),
+                (forecast.prediction_time for forecast in
+                 forecasts.after(datetime.now().astimezone() + timedelta(minutes=forecast_in - 5))),
                 None
             )
         },
-    ) for forecast_in in FORECAST_MINUTES),
+        exists_fn=lambda entry, forecast_in=forecast_in: (
+            forecast_in in FORECAST_MINUTES or entry.options.get(CONF_EXTRAPOLATION, False)
+        ),
+    ) for forecast_in in FORECAST_MINUTES + EXTRAPOLATION_MINUTES),
 ]
 
 
@@ -81,8 +84,12 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_class = (
+        UnrecordedRainingSensorEntity if entry.options.get(CONF_STATISTICS, False)
+        else RainingSensorEntity
+    )
     async_add_entities(
-        RainingSensorEntity(coordinator, description)
+        entity_class(coordinator, description)
         for description in PRECIPTITATION_SENSORS
         if description.exists_fn(entry)
     )
@@ -118,3 +125,9 @@ class RainingSensorEntity(DwdCoordinatorEntity, BinarySensorEntity):
         attributes[ATTR_ATTRIBUTION] = ATTRIBUTION
 
         return attributes
+
+
+class UnrecordedRainingSensorEntity(RainingSensorEntity):
+    """Raining sensor not recording volatile attributes."""
+
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
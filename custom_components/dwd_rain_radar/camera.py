@@ -0,0 +1,152 @@
+"""Camera entities for the DWD Rain Radar integration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.components.camera import Camera, CameraEntityDescription
+
+from .const import DOMAIN, ATTRIBUTION, CONF_RADAR_RADIUS, CONF_STATISTICS, DEFAULT_RADAR_RADIUS
+from homeassistant.const import (
+    ATTR_ATTRIBUTION
+)
+from .coordinator import DwdRainRadarUpdateCoordinator
+from .entity import DwdCoordinatorEntity, VOLATILE_ATTRIBUTES
+from .render import FrameCache, compress_frame, encode_apng, encode_png
+
+_LOGGER = logging.getLogger(__name__)
+
+# Default image size in pixels per grid cell (km)
+PIXELS_PER_CELL = 4
+
+CACHE_SIZE = 128
+
+
+@dataclass(frozen=True, kw_only=True)
+class RadarCameraEntityDescription(CameraEntityDescription):
+    """Provide a description for a radar camera."""
+
+    frames_fn: Callable[[list], list]
+    exists_fn: Callable[[dict], bool] = lambda _: True
+
+
+RADAR_CAMERAS = [
+    RadarCameraEntityDescription(
+        key="radar",
+        name="Radar",
+        frames_fn=lambda frames: next(
+            ([frame] for frame in frames if
+             frame[0] > datetime.now().astimezone() - timedelta(minutes=5)),
+            []
+        ),
+    ),
+    RadarCameraEntityDescription(
+        key="radar_loop",
+        name="Radar Loop",
+        entity_registry_enabled_default=False,
+        frames_fn=lambda frames: [
+            frame for frame in frames if
+            frame[0] > datetime.now().astimezone() - timedelta(minutes=5)
+        ],
+    ),
+]
+
+
+async def async_setup_entry(
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the camera platform."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_class = (
+        UnrecordedRadarCameraEntity if entry.options.get(CONF_STATISTICS, False)
+        else RadarCameraEntity
+    )
+    async_add_entities(
+        entity_class(coordinator, description)
+        for description in RADAR_CAMERAS
+        if description.exists_fn(entry)
+    )
+
+
+class RadarCameraEntity(DwdCoordinatorEntity, Camera):
+    """Implementation of a radar image camera."""
+
+    def __init__(
+            self,
+            coordinator: DwdRainRadarUpdateCoordinator,
+            description: RadarCameraEntityDescription,
+    ) -> None:
+        """Initialize the camera entity."""
+        super().__init__(coordinator, description)
+        Camera.__init__(self)
+
+        self.content_type = "image/png"
+        self._radius = coordinator.config_entry.options.get(CONF_RADAR_RADIUS, DEFAULT_RADAR_RADIUS)
+        self._cache = FrameCache(CACHE_SIZE)
+
+        self._attr_unique_id = (
+                f"{self.coordinator.config_entry.entry_id}"
+                + f"_{self.entity_description.key}"
+        )
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes of the device."""
+        return {
+            'latest_update': self.coordinator.latest_update,
+            ATTR_ATTRIBUTION: ATTRIBUTION,
+        }
+
+    async def async_camera_image(
+            self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return the radar image around the location."""
+        frames = self.entity_description.frames_fn(self.coordinator.location.frames)
+        if not frames:
+            return None
+
+        default_size = (2 * self._radius + 1) * PIXELS_PER_CELL
+        size = (width or height or default_size, height or width or default_size)
+
+        # Every run repeats valid times of the previous one at a shorter lead time
+        run_time = self.coordinator.location.run_time
+
+        data = []
+        for timestamp, values in frames:
+            key = (run_time, timestamp, (self.coordinator.lat, self.coordinator.lon, self._radius), size)
+            compressed = self._cache.get(key)
+            if compressed is None:
+                compressed = await self.hass.async_add_executor_job(
+                    compress_frame, self._crop(values), self.coordinator.radolan.product.scale, size
+                )
+                self._cache.put(key, compressed)
+            data.append(compressed)
+
+        if len(data) == 1:
+            return encode_png(data[0], size)
+
+        return encode_apng(data, size)
+
+    def _crop(self, values: np.ndarray) -> np.ndarray:
+        """Return the configured crop around the location."""
+        center = self.coordinator.location.crop_radius
+        return values[
+            center - self._radius:center + self._radius + 1,
+            center - self._radius:center + self._radius + 1,
+        ]
+
+
+class UnrecordedRadarCameraEntity(RadarCameraEntity):
+    """Radar camera not recording volatile attributes."""
+
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
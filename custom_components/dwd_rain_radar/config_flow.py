@@ -14,7 +14,17 @@ from homeassistant.const import CONF_NAME
 from .const import (
     DOMAIN,
     CONF_COORDINATES,
+    CONF_EXTRAPOLATION,
+    CONF_RADAR_RADIUS,
+    CONF_BACKGROUND_REFRESH,
+    CONF_OBSERVED_PRODUCT,
+    CONF_STATISTICS,
+    DEFAULT_RADAR_RADIUS,
 )
+from .products import OBSERVED_PRODUCTS, PRODUCTS
+
+# Option value for no observed precipitation
+NO_OBSERVED_PRODUCT = "none"
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +39,14 @@ class DwdRainRadarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         pass
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+            config_entry: config_entries.ConfigEntry,
+    ) -> DwdRainRadarOptionsFlow:
+        """Get the options flow for this handler."""
+        return DwdRainRadarOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle the user step.
 
@@ -65,3 +83,57 @@ class DwdRainRadarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders=placeholders,
             errors=errors,
         )
+
+
+class DwdRainRadarOptionsFlow(config_entries.OptionsFlow):
+    """Handle the options of a DWD Rain Radar entry."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+
+        if user_input is not None:
+            if user_input.get(CONF_OBSERVED_PRODUCT) == NO_OBSERVED_PRODUCT:
+                user_input = {**user_input, CONF_OBSERVED_PRODUCT: None}
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_EXTRAPOLATION,
+                    default=self._entry.options.get(CONF_EXTRAPOLATION, False),
+                    description="Extrapolate the forecast up to 3 hours",
+                ): bool,
+                vol.Optional(
+                    CONF_RADAR_RADIUS,
+                    default=self._entry.options.get(CONF_RADAR_RADIUS, DEFAULT_RADAR_RADIUS),
+                    description="Radius of the radar image in km",
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=300)),
+                vol.Optional(
+                    CONF_BACKGROUND_REFRESH,
+                    default=self._entry.options.get(CONF_BACKGROUND_REFRESH, False),
+                    description="Start without waiting for the first download",
+                ): bool,
+                vol.Optional(
+                    CONF_OBSERVED_PRODUCT,
+                    default=(
+                        self._entry.options.get(CONF_OBSERVED_PRODUCT)
+                        if self._entry.options.get(CONF_OBSERVED_PRODUCT) in OBSERVED_PRODUCTS
+                        else NO_OBSERVED_PRODUCT
+                    ),
+                    description="Observed precipitation product",
+                ): vol.In({
+                    NO_OBSERVED_PRODUCT: "None",
+                    **{key: PRODUCTS[key].name for key in OBSERVED_PRODUCTS},
+                }),
+                vol.Optional(
+                    CONF_STATISTICS,
+                    default=self._entry.options.get(CONF_STATISTICS, False),
+                    description="Record forecasts as statistics instead of state attributes",
+                ): bool,
+            }),
+        )
@@ -6,12 +6,43 @@ DOMAIN = "dwd_rain_radar"
 
 ATTRIBUTION = "Data provided by Deutscher Wetterdienst (DWD)"
 
-PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR]
+PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.CAMERA]
 
 CONF_COORDINATES = "coordinates"
 
+CONF_EXTRAPOLATION = "extrapolation"
+
+CONF_RADAR_RADIUS = "radar_radius"
+
+CONF_BACKGROUND_REFRESH = "background_refresh"
+
+CONF_OBSERVED_PRODUCT = "observed_product"
+
+CONF_STATISTICS = "statistics"
+
+# Radius in km of the radar image around the location
+DEFAULT_RADAR_RADIUS = 50
+
+# Shared RADOLAN product sources, keyed by product
+DATA_RADOLAN = f"{DOMAIN}_radolan"
+
+# Latest forecasts are stored per config entry to set up from cache
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.{{}}"
+
 DWD_OPENDATA_URL = "https://opendata.dwd.de"
 
 DWD_RADAR_COMPOSITE_RV_URL = f"{DWD_OPENDATA_URL}/weather/radar/composite/rv/DE1200_RV_LATEST.tar.bz2"
 
+DWD_RADOLAN_RY_URL = f"{DWD_OPENDATA_URL}/weather/radar/radolan/ry/raa01-ry_10000-latest-dwd---bin.bz2"
+
+DWD_RADOLAN_RW_URL = f"{DWD_OPENDATA_URL}/weather/radar/radolan/rw/raa01-rw_10000-latest-dwd---bin.bz2"
+
 FORECAST_MINUTES = [5, 10, 15, 20, 25, 30, 45, 60, 90, 120]
+
+# Additional forecasts produced by the optional motion-vector extrapolation
+EXTRAPOLATION_MINUTES = [150, 180]
+
+# Half the edge length (in km / grid cells) of the crop used for extrapolation
+EXTRAPOLATION_CROP_RADIUS = 64
+
@@ -2,41 +2,170 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
-from typing import List
+from typing import overload
 
-from homeassistant.core import HomeAssistant
+import numpy as np
+
+import httpx
+
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
+from homeassistant.const import CONF_NAME, UnitOfVolumetricFlux
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator
 )
 
-from .const import CONF_COORDINATES
+from .const import (
+    CONF_COORDINATES,
+    CONF_EXTRAPOLATION,
+    CONF_RADAR_RADIUS,
+    CONF_BACKGROUND_REFRESH,
+    CONF_OBSERVED_PRODUCT,
+    CONF_STATISTICS,
+    DATA_RADOLAN,
+    DEFAULT_RADAR_RADIUS,
+    DOMAIN,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .products import FORECAST_PRODUCT, OBSERVED_PRODUCTS, PRODUCTS, RadolanProduct
 from .radolan import Radolan
 
 _LOGGER = logging.getLogger(__name__)
 
 UPDATE_INTERVAL = timedelta(seconds=60)
 
+CACHE_SAVE_DELAY = 60
+
 
 @dataclass(slots=True)
 class PrecipitationForecast:
     """Model for precipitation forecast."""
-    precipitation: float
+    precipitation: float | None
     prediction_time: datetime
 
+
+class PrecipitationSeries(Sequence[PrecipitationForecast]):
+    """Immutable, time ordered precipitation forecasts.
+
+    Stored as parallel arrays of epoch seconds and hourly precipitation.
+    PrecipitationForecast instances are only created when items are accessed.
+    """
+
+    __slots__ = ("_timestamps", "_values")
+
+    def __init__(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Initialize the series from sorted arrays."""
+        self._timestamps = timestamps
+        self._values = values
+        self._timestamps.flags.writeable = False
+        self._values.flags.writeable = False
+
+    @classmethod
+    def from_radolan_data(cls, data, scale: float) -> PrecipitationSeries:
+        """Return instance of PrecipitationSeries."""
+        """Precipitation is summed over the product interval. Multiply it with scale to get hourly precipitation."""
+        timestamps, values = data
+        order = np.argsort(timestamps, kind="stable")
+        return cls(timestamps[order], values[order] * np.float32(scale))
+
     @classmethod
-    def from_radolan_data(cls, data) -> PrecipitationForecast:
-        """Return instance of Precipitation."""
-        """Precipitation is in 5 minute interval. Multiple it with 12 to get hourly precipitation."""
+    def from_cache(cls, data: dict) -> PrecipitationSeries:
+        """Return instance of PrecipitationSeries from stored data."""
         return cls(
-            prediction_time=data['timestamp'].astimezone(),
-            precipitation=round(data['value'] * 12, 2)
+            np.array(data['timestamps'], dtype=np.int64),
+            np.array([np.nan if value is None else value for value in data['values']], dtype=np.float32),
         )
 
+    @classmethod
+    def empty(cls) -> PrecipitationSeries:
+        """Return an empty series."""
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    @overload
+    def __getitem__(self, index: int) -> PrecipitationForecast: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> PrecipitationSeries: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PrecipitationSeries(self._timestamps[index], self._values[index])
+
+        value = self._values[index]
+        return PrecipitationForecast(
+            precipitation=None if np.isnan(value) else round(float(value), 2),
+            prediction_time=datetime.fromtimestamp(int(self._timestamps[index]), timezone.utc).astimezone(),
+        )
+
+    def __repr__(self) -> str:
+        return f"PrecipitationSeries(timestamps={self._timestamps!r}, values={self._values!r})"
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Return the read-only epoch seconds."""
+        return self._timestamps
+
+    @property
+    def values(self) -> np.ndarray:
+        """Return the read-only hourly precipitation, NaN where missing."""
+        return self._values
+
+    def after(self, time: datetime) -> PrecipitationSeries:
+        """Return the forecasts later than the given time."""
+        return self[np.searchsorted(self._timestamps, time.timestamp(), side="right"):]
+
+    def as_cache(self) -> dict:
+        """Return the series as JSON serializable data."""
+        return {
+            'timestamps': self._timestamps.tolist(),
+            'values': [None if np.isnan(value) else value for value in self._values.tolist()],
+        }
+
+    def current_hour(self) -> PrecipitationSeries:
+        """Return the forecasts in the hour of the last one."""
+        if not len(self):
+            return self
+        return self[np.searchsorted(self._timestamps, self._timestamps[-1] // 3600 * 3600):]
+
+    def merge(self, other: PrecipitationSeries) -> PrecipitationSeries:
+        """Return the forecasts of both series, preferring the other one at equal times."""
+        timestamps, index = np.unique(np.concatenate([other._timestamps, self._timestamps]), return_index=True)
+        return PrecipitationSeries(timestamps, np.concatenate([other._values, self._values])[index])
+
+    def hourly(self) -> list[tuple[datetime, float, float, float]]:
+        """Return the start, mean, min and max precipitation of every hour with data."""
+        hours = self._timestamps // 3600 * 3600
+        result = []
+        for hour in np.unique(hours):
+            values = self._values[hours == hour]
+            values = values[~np.isnan(values)]
+            if len(values):
+                result.append((
+                    datetime.fromtimestamp(int(hour), timezone.utc),
+                    float(values.mean()),
+                    float(values.min()),
+                    float(values.max()),
+                ))
+        return result
+
+    def rain_after(self, time: datetime) -> PrecipitationSeries:
+        """Return the forecasts later than the given time, starting with the first one with precipitation."""
+        start = np.searchsorted(self._timestamps, time.timestamp(), side="right")
+        rain = np.flatnonzero(self._values[start:] > 0)
+        return self[start + rain[0]:] if len(rain) else self[len(self):]
+
 
 class DwdRainRadarUpdateCoordinator(DataUpdateCoordinator):
     """Data update coordinator."""
@@ -59,20 +188,119 @@ class DwdRainRadarUpdateCoordinator(DataUpdateCoordinator):
         self.coords = entry.data[CONF_COORDINATES]
         self.lat = self.coords["latitude"]
         self.lon = self.coords["longitude"]
-        self.radolan = Radolan(self.lat, self.lon, self.async_client)
+        self.radolan = _get_radolan(hass, PRODUCTS[FORECAST_PRODUCT], async_client)
+        self.location = self.radolan.register(
+            self.lat,
+            self.lon,
+            crop_radius=entry.options.get(CONF_RADAR_RADIUS, DEFAULT_RADAR_RADIUS),
+            extrapolate=entry.options.get(CONF_EXTRAPOLATION, False),
+        )
+        self.observed_radolan = None
+        self.observed_location = None
+        if (observed_product := entry.options.get(CONF_OBSERVED_PRODUCT)) in OBSERVED_PRODUCTS:
+            self.observed_radolan = _get_radolan(hass, PRODUCTS[observed_product], async_client)
+            self.observed_location = self.observed_radolan.register(self.lat, self.lon)
+        self.observed = PrecipitationSeries.empty()
+        self._statistics = entry.options.get(CONF_STATISTICS, False)
+        self._statistics_archives = {}
+        self._observed_hour = PrecipitationSeries.empty()
         self.latest_update = None
+        self._store_forecasts = entry.options.get(CONF_BACKGROUND_REFRESH, False)
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id))
 
-    async def _async_update_data(self) -> List[PrecipitationForecast]:
-        """Update the data"""
-        data = await self.radolan.update()
+    @callback
+    def unregister(self) -> None:
+        """Stop decoding the location, and drop product sources no longer used."""
+        for radolan, location in [(self.radolan, self.location), (self.observed_radolan, self.observed_location)]:
+            if radolan is None:
+                continue
+            radolan.unregister(location)
+            if not radolan.locations:
+                self.hass.data[DATA_RADOLAN].pop(radolan.product.key)
+
+    async def async_load_cache(self) -> None:
+        """Set the data to the last stored forecasts, or no forecasts."""
+        cached = await self._store.async_load()
+        if cached is None:
+            self.data = PrecipitationSeries.empty()
+            return
 
-        forecasts = list(map(PrecipitationForecast.from_radolan_data, data))
+        self.data = PrecipitationSeries.from_cache(cached['forecasts'])
+        self.latest_update = datetime.fromisoformat(cached['latest_update'])
+
+    async def _async_update_data(self) -> PrecipitationSeries:
+        """Update the data"""
+        await asyncio.gather(self.radolan.update(), self._async_update_observed())
 
         """Make sure closest predictions are first"""
-        forecasts.sort(key=lambda forecast: forecast.prediction_time, reverse=False)
+        forecasts = PrecipitationSeries.from_radolan_data(self.location.curr_value, self.radolan.product.scale)
 
-        _LOGGER.debug("Fetched forecasts: {}".format(forecasts))
+        _LOGGER.debug("Fetched forecasts: %s", forecasts)
 
         self.latest_update = datetime.now()
 
+        self._async_add_statistics("forecast", "Precipitation Forecast", self.location, forecasts)
+        if self.observed_location is not None:
+            # Archives of 5 minute products hold a single frame, aggregate the running hour across them
+            self._observed_hour = self._observed_hour.merge(self.observed).current_hour()
+            self._async_add_statistics(
+                "observed", "Observed Precipitation", self.observed_location, self._observed_hour
+            )
+
+        if self._store_forecasts:
+            self._store.async_delay_save(
+                lambda: {'forecasts': forecasts.as_cache(), 'latest_update': self.latest_update.isoformat()},
+                CACHE_SAVE_DELAY,
+            )
+
         return forecasts
+
+    async def _async_update_observed(self) -> None:
+        """Update the observed precipitation, keeping the last one on errors."""
+        if self.observed_radolan is None:
+            return
+
+        try:
+            await self.observed_radolan.update()
+        except httpx.HTTPError as err:
+            _LOGGER.warning("Error fetching %s: %s", self.observed_radolan.product.key, err)
+            return
+
+        if self.observed_location.curr_value is not None:
+            self.observed = PrecipitationSeries.from_radolan_data(
+                self.observed_location.curr_value, self.observed_radolan.product.scale
+            )
+
+    @callback
+    def _async_add_statistics(self, key: str, name: str, location, series: PrecipitationSeries) -> None:
+        """Import the hourly precipitation as external statistics, once per archive."""
+        if not self._statistics or "recorder" not in self.hass.config.components:
+            return
+
+        if location.curr_value is None or self._statistics_archives.get(key) is location.curr_value:
+            return
+        self._statistics_archives[key] = location.curr_value
+
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{self.config_entry.title} {name}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{self.config_entry.entry_id.lower()}_{key}",
+                unit_of_measurement=UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
+            ),
+            [
+                StatisticData(start=start, mean=mean, min=minimum, max=maximum)
+                for start, mean, minimum, maximum in series.hourly()
+            ],
+        )
+
+
+def _get_radolan(hass: HomeAssistant, product: RadolanProduct, async_client) -> Radolan:
+    """Return the source of a product shared by all config entries."""
+    sources = hass.data.setdefault(DATA_RADOLAN, {})
+    if product.key not in sources:
+        sources[product.key] = Radolan(product, async_client)
+    return sources[product.key]
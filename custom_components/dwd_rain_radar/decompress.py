@@ -0,0 +1,159 @@
+"""Parallel decompression of bz2 compressed tar archives."""
+
+from __future__ import annotations
+
+import bz2
+import io
+import logging
+import os
+import re
+import tarfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+BLOCK_MAGIC = 0x314159265359
+STREAM_END_MAGIC = 0x177245385090
+MAGIC_BITS = 48
+CRC_BITS = 32
+
+# Byte aligned start of a stream: "BZh", the block size and the first block
+STREAM_HEADER = re.compile(rb"BZh[1-9]\x31\x41\x59\x26\x53\x59")
+
+# Do not bother splitting archives with fewer blocks
+MIN_BLOCKS = 2
+
+
+def open_tar(data: bytes) -> tarfile.TarFile:
+    """Open a bz2 compressed tar archive, decompressing it in parallel if possible.
+
+    The archive is decompressed with the streaming single-threaded decoder if it
+    cannot be split or the host has a single core. In parallel, at most one
+    block per worker is decompressed ahead of the reader.
+    """
+    workers = os.cpu_count() or 1
+
+    if workers > 1:
+        try:
+            streams = _split(data)
+            if len(streams) >= MIN_BLOCKS:
+                chunks = _decompress(streams, min(workers, len(streams)))
+                return tarfile.open(fileobj=_ChunkReader(chunks), mode="r|")
+        except (OSError, ValueError, EOFError) as err:
+            _LOGGER.debug("Parallel bz2 decompression failed, falling back: %s", err)
+
+    return tarfile.open(fileobj=io.BytesIO(data), mode="r:bz2")
+
+
+def _decompress(streams: list[bytes], workers: int) -> Iterator[bytes]:
+    """Yield the decompressed streams in order, keeping `workers` streams in flight."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for stream in streams:
+            pending.append(executor.submit(bz2.decompress, stream))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def _split(data: bytes) -> list[bytes]:
+    """Split bz2 data into independently decompressable streams."""
+
+    # Parallel compressors concatenate streams, every stream can be decompressed as is
+    starts = [match.start() for match in STREAM_HEADER.finditer(data)]
+    if len(starts) > 1 and starts[0] == 0:
+        return [data[start:end] for start, end in zip(starts, starts[1:] + [len(data)])]
+
+    if not data.startswith(b"BZh"):
+        raise ValueError("Not a bz2 stream")
+
+    return _split_blocks(data)
+
+
+def _split_blocks(data: bytes) -> list[bytes]:
+    """Split a single bz2 stream at its block boundaries into one stream per block."""
+    header = data[:4]
+    blocks = _find_magic(data, BLOCK_MAGIC)
+    ends = _find_magic(data, STREAM_END_MAGIC)
+
+    if not blocks or not ends or len(blocks) < MIN_BLOCKS:
+        return [data]
+
+    # Anything after the first stream, e.g. a second stream, is not handled here
+    end = ends[0]
+    blocks = [block for block in blocks if block < end]
+
+    streams = []
+    combined_crc = 0
+    for start, stop in zip(blocks, blocks[1:] + [end]):
+        crc = _bits(data, start + MAGIC_BITS, start + MAGIC_BITS + CRC_BITS)
+        combined_crc = (((combined_crc << 1) | (combined_crc >> 31)) & 0xFFFFFFFF) ^ crc
+
+        # The block followed by an end of stream marker carrying the block CRC
+        length = stop - start + MAGIC_BITS + CRC_BITS
+        value = (_bits(data, start, stop) << (MAGIC_BITS + CRC_BITS)) | (STREAM_END_MAGIC << CRC_BITS) | crc
+        padding = -length % 8
+        streams.append(header + (value << padding).to_bytes((length + padding) // 8, "big"))
+
+    if combined_crc != _bits(data, end + MAGIC_BITS, end + MAGIC_BITS + CRC_BITS):
+        raise ValueError("Combined CRC mismatch, block boundaries are wrong")
+
+    return streams
+
+
+def _find_magic(data: bytes, magic: int) -> list[int]:
+    """Return the sorted bit offsets of a 48 bit magic number at any bit alignment."""
+    positions = []
+    for shift in range(8):
+        # The bytes entirely covered by the magic when it starts `shift` bits into a byte
+        window = (magic << (56 - MAGIC_BITS - shift)).to_bytes(7, "big")
+        first = 0 if shift == 0 else 1
+        needle = window[first:6]
+
+        index = data.find(needle)
+        while index != -1:
+            bit = (index - first) * 8 + shift
+            if bit >= 0 and _bits(data, bit, bit + MAGIC_BITS) == magic:
+                positions.append(bit)
+            index = data.find(needle, index + 1)
+
+    return sorted(positions)
+
+
+def _bits(data: bytes, start: int, end: int) -> int:
+    """Return the bits [start, end) of data as an integer."""
+    first = start // 8
+    last = (end + 7) // 8
+    if last > len(data):
+        raise ValueError("Bit range exceeds data")
+    value = int.from_bytes(data[first:last], "big")
+    return (value >> (last * 8 - end)) & ((1 << (end - start)) - 1)
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read byte chunks as one stream, only pulling the next chunk once the previous one is read."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        """Initialize the reader."""
+        self._chunks = iter(chunks)
+        self._current = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._current:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._current = memoryview(chunk)
+
+        size = min(len(buffer), len(self._current))
+        buffer[:size] = self._current[:size]
+        self._current = self._current[size:]
+
+        return size
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from homeassistant.const import ATTR_ATTRIBUTION
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
@@ -9,6 +10,14 @@ from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from .const import DOMAIN
 from .coordinator import DwdRainRadarUpdateCoordinator
 
+# Attributes changing on every update, not recorded with the statistics option
+VOLATILE_ATTRIBUTES = frozenset({
+    'prediction_time',
+    'observation_time',
+    'latest_update',
+    ATTR_ATTRIBUTION,
+})
+
 
 class DwdCoordinatorEntity(CoordinatorEntity[DwdRainRadarUpdateCoordinator]):
     """Coordinator entity."""
@@ -0,0 +1,162 @@
+"""Motion-vector extrapolation of radar frames beyond the RV forecast horizon."""
+
+from __future__ import annotations
+
+import numpy as np
+
+TILE_SIZE = 32  # Edge length of the tiles a motion vector is estimated for
+FRAME_LAG = 3  # Estimate motion between frames this many intervals apart
+MOTION_PAIRS = 3  # Number of frame pairs the motion is averaged over
+MIN_WET_FRACTION = 0.05  # Tiles with less rain fall back to the global vector
+RAIN_THRESHOLD = 0.01
+
+
+def extrapolate(frames: list[np.ndarray], steps: int) -> list[np.ndarray]:
+    """Extrapolate the last frame `steps` intervals into the future.
+
+    All frames must be crops of the same size, ordered by time and one
+    interval apart. Pixels advected in from outside the crop are NaN.
+    """
+    if steps <= 0 or len(frames) < FRAME_LAG + 1:
+        return []
+
+    motion = estimate_motion(frames)
+
+    return [advect(frames[-1], motion, step) for step in range(1, steps + 1)]
+
+
+def estimate_motion(frames: list[np.ndarray]) -> np.ndarray:
+    """Estimate the motion field in pixels per interval.
+
+    Returns an array of shape (2, rows, cols) holding the y and x velocity
+    of every pixel of the crop.
+    """
+    shape = frames[-1].shape
+    pairs = [
+        (frames[i - FRAME_LAG], frames[i])
+        for i in range(len(frames) - 1, FRAME_LAG - 1, -1)
+    ][:MOTION_PAIRS]
+
+    tile_motion = np.mean([_tile_shifts(prev, curr) for prev, curr in pairs], axis=0) / FRAME_LAG
+
+    return _upsample(tile_motion, shape)
+
+
+def advect(frame: np.ndarray, motion: np.ndarray, step: int) -> np.ndarray:
+    """Move a frame `step` intervals along the motion field (semi-Lagrangian, nearest neighbour)."""
+    rows, cols = frame.shape
+    y, x = np.indices(frame.shape)
+    src_y = np.rint(y - step * motion[0]).astype(np.intp)
+    src_x = np.rint(x - step * motion[1]).astype(np.intp)
+
+    inside = (src_y >= 0) & (src_y < rows) & (src_x >= 0) & (src_x < cols)
+
+    result = np.full(frame.shape, np.nan, dtype=frame.dtype)
+    result[inside] = frame[src_y[inside], src_x[inside]]
+
+    return result
+
+
+def _tile_shifts(prev: np.ndarray, curr: np.ndarray) -> np.ndarray:
+    """Return the (y, x) shift of every tile from `prev` to `curr`, shape (2, tiles_y, tiles_x)."""
+    tiles_y = prev.shape[0] // TILE_SIZE
+    tiles_x = prev.shape[1] // TILE_SIZE
+
+    prev_tiles = _tiles(prev, tiles_y, tiles_x)
+    curr_tiles = _tiles(curr, tiles_y, tiles_x)
+
+    # Whole crop, block-averaged into one extra tile, as coarse global motion
+    shifts = _phase_correlation(
+        np.concatenate([prev_tiles, _resample(prev, tiles_y, tiles_x)[None]]),
+        np.concatenate([curr_tiles, _resample(curr, tiles_y, tiles_x)[None]]),
+    )
+    coarse_shift = shifts[-1] * np.array([tiles_y, tiles_x])
+    shifts = shifts[:-1]
+
+    # Dry tiles take the mean motion of the wet ones
+    wet = (np.nan_to_num(curr_tiles) > RAIN_THRESHOLD).mean(axis=(1, 2)) >= MIN_WET_FRACTION
+    shifts[~wet] = shifts[wet].mean(axis=0) if wet.any() else coarse_shift
+
+    return shifts.T.reshape(2, tiles_y, tiles_x)
+
+
+def _tiles(frame: np.ndarray, tiles_y: int, tiles_x: int) -> np.ndarray:
+    """Split a frame into a stack of TILE_SIZE x TILE_SIZE tiles."""
+    frame = np.nan_to_num(frame[:tiles_y * TILE_SIZE, :tiles_x * TILE_SIZE])
+    return (
+        frame.reshape(tiles_y, TILE_SIZE, tiles_x, TILE_SIZE)
+        .swapaxes(1, 2)
+        .reshape(-1, TILE_SIZE, TILE_SIZE)
+    )
+
+
+def _resample(frame: np.ndarray, tiles_y: int, tiles_x: int) -> np.ndarray:
+    """Block-average the whole frame down to a single TILE_SIZE x TILE_SIZE tile."""
+    frame = np.nan_to_num(frame[:tiles_y * TILE_SIZE, :tiles_x * TILE_SIZE])
+    return frame.reshape(TILE_SIZE, tiles_y, TILE_SIZE, tiles_x).mean(axis=(1, 3))
+
+
+def _phase_correlation(prev: np.ndarray, curr: np.ndarray) -> np.ndarray:
+    """Return the sub-pixel (y, x) shift of each tile in a stack, shape (tiles, 2)."""
+    window = np.outer(np.hanning(TILE_SIZE), np.hanning(TILE_SIZE))
+    prev_spectrum = np.fft.fft2((prev - prev.mean(axis=(1, 2), keepdims=True)) * window)
+    curr_spectrum = np.fft.fft2((curr - curr.mean(axis=(1, 2), keepdims=True)) * window)
+
+    cross = curr_spectrum * np.conj(prev_spectrum)
+    cross /= np.maximum(np.abs(cross), 1e-9)
+    correlation = np.fft.ifft2(cross).real
+
+    flat = correlation.reshape(len(correlation), -1).argmax(axis=1)
+    peak_y, peak_x = np.unravel_index(flat, (TILE_SIZE, TILE_SIZE))
+    index = np.arange(len(correlation))
+
+    shift_y = peak_y + _parabolic_offset(
+        correlation[index, (peak_y - 1) % TILE_SIZE, peak_x],
+        correlation[index, peak_y, peak_x],
+        correlation[index, (peak_y + 1) % TILE_SIZE, peak_x],
+    )
+    shift_x = peak_x + _parabolic_offset(
+        correlation[index, peak_y, (peak_x - 1) % TILE_SIZE],
+        correlation[index, peak_y, peak_x],
+        correlation[index, peak_y, (peak_x + 1) % TILE_SIZE],
+    )
+
+    shifts = np.stack([shift_y, shift_x], axis=1)
+    shifts[shifts > TILE_SIZE / 2] -= TILE_SIZE
+
+    # A dry tile correlates to noise; treat it as stationary
+    shifts[~np.any(curr, axis=(1, 2)) | ~np.any(prev, axis=(1, 2))] = 0
+
+    return shifts
+
+
+def _parabolic_offset(left: np.ndarray, center: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Refine a correlation peak to sub-pixel precision."""
+    denominator = left - 2 * center + right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        offset = np.where(denominator != 0, 0.5 * (left - right) / denominator, 0.0)
+    return np.clip(offset, -0.5, 0.5)
+
+
+def _upsample(tile_motion: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+    """Bilinearly interpolate a per-tile motion field to every pixel."""
+    _, tiles_y, tiles_x = tile_motion.shape
+    centers_y = (np.arange(tiles_y) + 0.5) * TILE_SIZE
+    centers_x = (np.arange(tiles_x) + 0.5) * TILE_SIZE
+
+    pos_y = np.clip(np.interp(np.arange(shape[0]), centers_y, np.arange(tiles_y)), 0, tiles_y - 1)
+    pos_x = np.clip(np.interp(np.arange(shape[1]), centers_x, np.arange(tiles_x)), 0, tiles_x - 1)
+
+    y0 = np.floor(pos_y).astype(np.intp)
+    x0 = np.floor(pos_x).astype(np.intp)
+    y1 = np.minimum(y0 + 1, tiles_y - 1)
+    x1 = np.minimum(x0 + 1, tiles_x - 1)
+    wy = (pos_y - y0)[:, None]
+    wx = (pos_x - x0)[None, :]
+
+    return (
+        tile_motion[:, y0][:, :, x0] * (1 - wy) * (1 - wx)
+        + tile_motion[:, y0][:, :, x1] * (1 - wy) * wx
+        + tile_motion[:, y1][:, :, x0] * wy * (1 - wx)
+        + tile_motion[:, y1][:, :, x1] * wy * wx
+    )
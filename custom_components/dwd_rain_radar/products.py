@@ -0,0 +1,128 @@
+"""RADOLAN products and grids published on DWD OpenData."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import timedelta
+
+from .const import (
+    DWD_RADAR_COMPOSITE_RV_URL,
+    DWD_RADOLAN_RW_URL,
+    DWD_RADOLAN_RY_URL,
+)
+
+# Polar stereographic projection of all RADOLAN grids
+LON_0 = 10  # Longitude of the central meridian
+LAT_TS = 60  # Latitude of true scale
+
+# WGS84 ellipsoid
+WGS84_A = 6378137  # Semi-major axis
+WGS84_B = 6356752.3142451802  # Semi-minor axis
+
+# Earth radius of the spherical grids
+EARTH_RADIUS = 6370040
+
+
+@dataclass(frozen=True, kw_only=True)
+class RadolanGrid:
+    """Polar stereographic grid of 1 km cells, rows stored south to north."""
+
+    rows: int
+    cols: int
+    # Projected coordinates in m of the lower left corner
+    x_ll: float
+    y_ll: float
+    ellipsoid: bool = False
+
+    def coordinates(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Return the (column, row) of the cell containing the location."""
+        """see https://debug-docs.readthedocs.io/en/conda_pip/notebooks/radolan/radolan_grid.html#Polar-Stereographic-Projection"""
+        """see https://www.dwd.de/DE/leistungen/radarprodukte/formatbeschreibung_rv.pdf"""
+        rho = self._rho(math.radians(latitude))
+        lon = math.radians(longitude - LON_0)
+
+        x = rho * math.sin(lon)
+        y = -rho * math.cos(lon)
+
+        return int(round((x - self.x_ll) / 1000, 0)), int(round((y - self.y_ll) / 1000, 0))
+
+    def _rho(self, lat: float) -> float:
+        """Return the distance in m from the north pole in the projection plane."""
+        lat_ts = math.radians(LAT_TS)
+
+        if not self.ellipsoid:
+            return EARTH_RADIUS * (1 + math.sin(lat_ts)) * math.cos(lat) / (1 + math.sin(lat))
+
+        e = math.sqrt(1 - (WGS84_B ** 2 / WGS84_A ** 2))
+
+        def t(phi: float) -> float:
+            return math.tan(math.pi / 4 - phi / 2) / ((1 - e * math.sin(phi)) / (1 + e * math.sin(phi))) ** (e / 2)
+
+        m = WGS84_A * math.cos(lat_ts) / math.sqrt(1 - e ** 2 * math.sin(lat_ts) ** 2)
+
+        return m * t(lat) / t(lat_ts)
+
+
+# Composite grid of the RV forecasts
+GRID_DE1200 = RadolanGrid(rows=1200, cols=1100, x_ll=-543696.83521776402, y_ll=-4822088.8619310018, ellipsoid=True)
+
+# National grid of RW and RY
+GRID_DE900 = RadolanGrid(rows=900, cols=900, x_ll=-523462.2, y_ll=-4658644.7)
+
+
+@dataclass(frozen=True, kw_only=True)
+class RadolanProduct:
+    """Provide a description for a RADOLAN product."""
+
+    key: str
+    name: str
+    url: str
+    grid: RadolanGrid
+    # Time between frames, values are precipitation sums over it
+    interval: timedelta
+    # Converts the decoded values to mm/h
+    scale: float
+    # Minimum time between downloads
+    update_interval: timedelta
+    # tar archive of forecast frames instead of a single file
+    archive: bool = False
+
+
+PRODUCTS = {
+    product.key: product
+    for product in [
+        RadolanProduct(
+            key="rv",
+            name="RV 5 minute precipitation forecast",
+            url=DWD_RADAR_COMPOSITE_RV_URL,
+            grid=GRID_DE1200,
+            interval=timedelta(minutes=5),
+            scale=12,
+            update_interval=timedelta(seconds=60),
+            archive=True,
+        ),
+        RadolanProduct(
+            key="ry",
+            name="RY 5 minute precipitation",
+            url=DWD_RADOLAN_RY_URL,
+            grid=GRID_DE900,
+            interval=timedelta(minutes=5),
+            scale=12,
+            update_interval=timedelta(seconds=60),
+        ),
+        RadolanProduct(
+            key="rw",
+            name="RW hourly precipitation",
+            url=DWD_RADOLAN_RW_URL,
+            grid=GRID_DE900,
+            interval=timedelta(hours=1),
+            scale=1,
+            update_interval=timedelta(minutes=5),
+        ),
+    ]
+}
+
+FORECAST_PRODUCT = "rv"
+
+OBSERVED_PRODUCTS = ["ry", "rw"]
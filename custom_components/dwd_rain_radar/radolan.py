@@ -1,173 +1,309 @@
 # -*- coding: utf-8 -*-
 import asyncio
-import tarfile
+import bz2
+import io
 import logging
-from io import BytesIO
+import re
+import time
 
 import httpx
+import numpy as np
 
 from datetime import datetime, timedelta, timezone
 
-import math
-
-from .const import DWD_RADAR_COMPOSITE_RV_URL
+from .const import EXTRAPOLATION_CROP_RADIUS, EXTRAPOLATION_MINUTES, FORECAST_MINUTES
+from .decompress import open_tar
+from .extrapolation import extrapolate
+from .products import RadolanProduct
 
 _LOGGER = logging.getLogger(__name__)
 
+MISSING_FLAG = 0x2000
+VALUE_MASK = 0x0FFF
+
+# Refreshes this much earlier than the product's update interval still download
+UPDATE_TOLERANCE = 5
+
+# Bytes read at once when skipping rows before the bounding box
+SKIP_CHUNK_SIZE = 1 << 20
+
+HEADER_END = b'\x03'
+HEADER_GRID = re.compile(rb"GP\s*(\d+)x\s*(\d+)")
+HEADER_PRECISION = re.compile(rb"PR\s*E([-+]?\d+)")
+HEADER_FORECAST = re.compile(rb"VV\s*(\d+)")
+
+
+class RadolanLocation:
+    """Location registered with a product, and the data decoded for it."""
+
+    def __init__(self, coord: tuple[int, int], radius: int, extrapolate: bool):
+        """Initialize instance."""
+        self.coord = coord
+        self.crop_radius = radius
+        self.extrapolate = extrapolate
+
+        self.curr_value = None
+        self.frames = []
+
+    @property
+    def run_time(self):
+        """Return the analysis time of the decoded run, the valid time of its earliest frame."""
+        return self.frames[0][0] if self.frames else None
+
 
 class Radolan:
-    """Radolan class."""
+    """Radolan class.
 
-    def __init__(
-            self,
-            latitude: float,
-            longitude: float,
-            async_client: httpx.AsyncClient
-    ):
+    Downloads and decodes one product for all locations registered with it.
+    """
+
+    def __init__(self, product: RadolanProduct, async_client: httpx.AsyncClient):
         """Initialize instance."""
+        self.product = product
         self._async_client = async_client
-        self._lat = latitude
-        self._lon = longitude
         self._last_etag = None
+        self._last_response = None
+        self._last_fetch = None
+        self._lock = asyncio.Lock()
 
-        self._radolan_coord = None
-        self.curr_value = None
+        self.locations: list[RadolanLocation] = []
+
+    def register(
+            self,
+            latitude: float,
+            longitude: float,
+            crop_radius: int = 0,
+            extrapolate: bool = False,
+    ) -> RadolanLocation:
+        """Register a location to decode on every update."""
+        location = RadolanLocation(
+            self.product.grid.coordinates(latitude, longitude),
+            max(crop_radius, EXTRAPOLATION_CROP_RADIUS if extrapolate else 0),
+            extrapolate,
+        )
+        self.locations.append(location)
+        return location
+
+    def unregister(self, location: RadolanLocation) -> None:
+        """Stop decoding a location."""
+        self.locations.remove(location)
 
     async def update(self):
-        """Update DWD Radar data."""
-        url = self._get_url()
-        headers = {}
-        if self._last_etag is not None:
-            headers["If-None-Match"] = self._last_etag
+        """Update DWD Radar data.
+
+        Concurrent updates share one download, which happens at most once per
+        update interval of the product.
+        """
+        async with self._lock:
+            if (self._last_fetch is not None and time.monotonic() - self._last_fetch
+                    < self.product.update_interval.total_seconds() - UPDATE_TOLERANCE):
+                await self._parse_new_locations()
+                return
+
+            url = self.product.url
+            headers = {}
+            if self._last_etag is not None:
+                headers["If-None-Match"] = self._last_etag
 
-        resp = await self._async_client.get(url, headers=headers)
+            resp = await self._async_client.get(url, headers=headers)
 
-        _LOGGER.debug(f"Response {resp.status_code} (Headers: {resp.headers}) from {url}")
+            _LOGGER.debug(f"Response {resp.status_code} (Headers: {resp.headers}) from {url}")
 
-        if resp.status_code == 304:
-            return self.curr_value
+            if resp.status_code == 304:
+                self._last_fetch = time.monotonic()
+                await self._parse_new_locations()
+                return
 
-        if resp.status_code != httpx.codes.OK:
-            resp.raise_for_status()
+            if resp.status_code != httpx.codes.OK:
+                resp.raise_for_status()
+
+            response = resp.read()
+            locations = list(self.locations)
+
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(None, self._parse, response, locations)
+
+            for location, (timestamps, values, frames) in zip(locations, results):
+                location.curr_value = (timestamps, values)
+                location.frames = frames
+
+            self._last_response = response
+            self._last_etag = resp.headers["ETag"]
+            self._last_fetch = time.monotonic()
+
+    async def _parse_new_locations(self):
+        """Decode the last response for locations registered since it was downloaded."""
+        locations = [location for location in self.locations if location.curr_value is None]
+        if not locations or self._last_response is None:
+            return
 
         loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, self._parse, self._last_response, locations)
+
+        for location, (timestamps, values, frames) in zip(locations, results):
+            location.curr_value = (timestamps, values)
+            location.frames = frames
 
-        self.curr_value = await loop.run_in_executor(None, self._parse, resp.read())
+    def _parse(self, response, locations):
+        """Parse the response.
 
-        self._last_etag = resp.headers["ETag"]
+        Returns per location the epoch seconds and values at the location as
+        arrays, and the decoded crops around it, ordered by time. Missing
+        values are NaN.
+        """
 
-        return self.curr_value
+        frames = [[] for _ in locations]
+        bounds = self._bounds(locations)
 
-    def _get_url(self) -> str:
-        """Return the url."""
-        return DWD_RADAR_COMPOSITE_RV_URL
+        for f in self._open(response):
+            header = self._read_header(f)
+            area = self._decode(self._read_area(header, f, locations, bounds), header['precision'])
 
-    def _parse(self, response):
-        """Parse the response."""
+            # The area spans the space between locations, only their crops are kept
+            for location_frames, location in zip(frames, locations):
+                location_frames.append((header['timestamp'], self._crop(area, location, bounds).copy()))
 
-        tar = tarfile.open(fileobj=BytesIO(response), mode="r:bz2")
-        result = []
+        results = []
+        for location, location_frames in zip(locations, frames):
+            location_frames.sort(key=lambda frame: frame[0])
+
+            if location.extrapolate:
+                location_frames.extend(self._extrapolate_frames(location_frames, location.crop_radius))
+
+            center = location.crop_radius
+            timestamps = np.array([timestamp.timestamp() for timestamp, _ in location_frames], dtype=np.int64)
+            values = np.array([values[center, center] for _, values in location_frames], dtype=np.float32)
+
+            results.append((timestamps, values, location_frames))
+
+        return results
+
+    def _open(self, response):
+        """Yield a file object per frame of the response."""
+        if not self.product.archive:
+            yield io.BytesIO(bz2.decompress(response))
+            return
+
+        tar = open_tar(response)
 
         for tarinfo in tar:
 
             if not tarinfo.isreg():
                 continue
 
-            # Read the file
-            f = tar.extractfile(tarinfo)
-            header = self._read_header(f)
-            # coord = self._get_closest_grid_indices(header['dimension'])
-            coord = self._get_radolan_rv_coord()
-            value = self._read_values(header, f, coord)
+            yield tar.extractfile(tarinfo)
 
-            result.append({
-                'timestamp': header['timestamp'],
-                'value': value,
-            })
+    def _extrapolate_frames(self, frames, center):
+        """Extend the forecast beyond the RV horizon by advecting the last frame."""
+        interval = self.product.interval
+        steps = (max(EXTRAPOLATION_MINUTES) - max(FORECAST_MINUTES)) // int(interval.total_seconds() // 60)
+        last_timestamp = frames[-1][0]
+
+        extrapolated = extrapolate([values for _, values in frames], steps)
+
+        result = []
+        for step, values in enumerate(extrapolated, start=1):
+            if np.isnan(values[center, center]):  # Advected in from outside the crop
+                break
+
+            result.append((last_timestamp + interval * step, values))
 
         return result
 
     def _read_header(self, stream):
         """Read the header information from the Radolan file."""
-        headerBytes = stream.read(91)
-        assert len(headerBytes) == 91, 'file too short'
-        msLen = int(headerBytes[88:91])
-        stream.read(msLen)
-        assert stream.read(1) == b'\x03', '\\x03 at the end of header is missing -> wrong file format'
-        dimension = headerBytes[60:69]
-        [size_y, size_x] = map(lambda val: int(val), dimension.split(b'x', 2))
+        headerBytes = bytearray()
+        while not headerBytes.endswith(HEADER_END):
+            byte = stream.read(1)
+            assert byte, '\\x03 at the end of header is missing -> wrong file format'
+            headerBytes += byte
+
+        # The station list is free text, only parse the fields before it
+        fields = bytes(headerBytes).split(b'MS', 1)[0]
+
+        grid = HEADER_GRID.search(fields)
+        assert grid, 'grid dimension is missing from the header'
+        [size_y, size_x] = map(int, grid.groups())
         DDhhmm = headerBytes[2:8]
         MMYY = headerBytes[13:17]
         timestamp = self._convert_to_timestamp(DDhhmm.decode(), MMYY.decode())
-        precisionStr = headerBytes[47:51]
-        precision = self._decode_precision(precisionStr.decode())
-        forecast = headerBytes[72:75]
+        precision = HEADER_PRECISION.search(fields)
+        assert precision, 'precision is missing from the header'
+        forecast = HEADER_FORECAST.search(fields)
 
         return {
             'dimension': {'x': size_x, 'y': size_y},
-            'precision': precision,
-            'timestamp': timestamp + timedelta(minutes=int(forecast)),
+            'precision': pow(10, int(precision.group(1))),
+            'timestamp': timestamp + timedelta(minutes=int(forecast.group(1)) if forecast else 0),
         }
 
-    def _decode_precision(self, precision):
-        return pow(10, int(precision[1:4]))
-
     def _convert_to_timestamp(self, DDhhmm, MMYY):
         return datetime(int('20' + MMYY[2:4]), int(MMYY[0:2]), int(DDhhmm[0:2]),
                         int(DDhhmm[2:4]), int(DDhhmm[4:6]), 0, tzinfo=timezone.utc)
 
-    def _read_values(self, header, stream, coord):
-        """Read the data values from the Radolan file."""
+    def _bounds(self, locations):
+        """Return the union bounding box (x_start, y_start, x_end, y_end) of the crops of all locations.
+
+        The box may extend beyond the grid.
+        """
+        return (
+            min((location.coord[0] - location.crop_radius for location in locations), default=0),
+            min((location.coord[1] - location.crop_radius for location in locations), default=0),
+            max((location.coord[0] + location.crop_radius + 1 for location in locations), default=0),
+            max((location.coord[1] + location.crop_radius + 1 for location in locations), default=0),
+        )
+
+    def _read_area(self, header, stream, locations, bounds):
+        """Read the raw values within the bounding box from the Radolan file.
+
+        Rows outside the box are not converted, cells
+        outside the grid are filled with the missing data flag.
+        """
         header_x = header['dimension']['x']
         header_y = header['dimension']['y']
 
-        assert coord[0] <= header_x, f"x ({coord[0]}) shall be lesser than {header_x}"
-        assert coord[1] <= header_y, f"y ({coord[1]}) shall be lesser than {header_y}"
-
-        dataRow = bytearray(header_x * 2)
-
-        for curY in range(header_y):
-            assert stream.readinto(dataRow) == len(dataRow), 'file too short'
-            if curY == coord[1]:
-                valBytes = dataRow[coord[0] * 2: coord[0] * 2 + 2]
-                if valBytes == b'\xc4\x29':  # Special value indicating missing data
-                    return None
-                else:
-                    return float(int.from_bytes(valBytes, 'little')) * header['precision']
-
-    def _get_radolan_rv_coord(self):
-        """Calculate Radolan grid coordinates for the given latitude and longitude."""
-        """see https://debug-docs.readthedocs.io/en/conda_pip/notebooks/radolan/radolan_grid.html#Polar-Stereographic-Projection"""
-        """see https://www.dwd.de/DE/leistungen/radarprodukte/formatbeschreibung_rv.pdf"""
-        if self._radolan_coord is None:
-            lat_0 = 90  # Latitude of the projection's origin (north pole)
-            lon_0 = 10  # Longitude of the central meridian
-            a = 6378137  # Semi-major axis (WGS84)
-            b = 6356752.3142451802  # Semi-minor axis (WGS84)
-            e2 = 1 - (b ** 2 / a ** 2)  # Eccentricity squared
-            lat_ts = 60  # Latitude of true scale
-            x_0 = 543696.83521776402
-            y_0 = 3622088.8619310018
-
-            lat_rad = math.radians(self._lat)
-            lon_rad = math.radians(self._lon)
-            lat_0_rad = math.radians(lat_0)
-            lon_0_rad = math.radians(lon_0)
-            lat_ts_rad = math.radians(lat_ts)
-
-            t = math.tan(math.pi / 4 - lat_rad / 2) / (
-                    (1 - math.sqrt(e2) * math.sin(lat_rad)) / (1 + math.sqrt(e2) * math.sin(lat_rad))) ** (
-                        math.sqrt(e2) / 2)
-            t_0 = math.tan(math.pi / 4 - lat_ts_rad / 2) / (
-                    (1 - math.sqrt(e2) * math.sin(lat_ts_rad)) / (1 + math.sqrt(e2) * math.sin(lat_ts_rad))) ** (
-                          math.sqrt(e2) / 2)
-
-            m = a * math.cos(lat_ts_rad) / math.sqrt(1 - e2 * math.sin(lat_ts_rad) ** 2)
-
-            rho = m * t / t_0
-            x = x_0 + rho * math.sin(lon_rad - lon_0_rad)
-            y = y_0 - rho * math.cos(lon_rad - lon_0_rad)
-
-            self._radolan_coord = ((int(round(x / 1000, 0)), int(round(y / 1000 + 1200, 0))))
-
-        return self._radolan_coord
+        x_start, y_start, x_end, y_end = bounds
+        area = np.full((y_end - y_start, x_end - x_start), MISSING_FLAG, dtype=np.uint16)
+
+        rows_start = max(y_start, 0)
+        rows_end = min(y_end, header_y)
+        cols_start = max(x_start, 0)
+        cols_end = min(x_end, header_x)
+        if rows_end <= rows_start or cols_end <= cols_start:
+            return area
+
+        # Tar members of a streamed archive cannot seek, read past the rows before the box
+        skip = rows_start * header_x * 2
+        while skip > 0:
+            skipped = len(stream.read(min(skip, SKIP_CHUNK_SIZE)))
+            assert skipped, 'file too short'
+            skip -= skipped
+
+        # Rows after the box are never read
+        data = stream.read((rows_end - rows_start) * header_x * 2)
+        assert len(data) == (rows_end - rows_start) * header_x * 2, 'file too short'
+        rows = np.frombuffer(data, dtype='<u2').reshape(rows_end - rows_start, header_x)
+
+        area[
+            rows_start - y_start:rows_end - y_start,
+            cols_start - x_start:cols_end - x_start,
+        ] = rows[:, cols_start:cols_end]
+
+        return area
+
+    def _crop(self, area, location, bounds):
+        """Return the square crop centered on the location as a view into the area."""
+        x_start, y_start = bounds[:2]
+        x, y = location.coord
+        radius = location.crop_radius
+
+        return area[
+            y - radius - y_start:y + radius + 1 - y_start,
+            x - radius - x_start:x + radius + 1 - x_start,
+        ]
+
+    def _decode(self, crop, precision):
+        """Decode a raw crop into a float array with NaN for missing data."""
+        values = (crop & VALUE_MASK).astype(np.float32) * np.float32(precision)
+        values[(crop & MISSING_FLAG) != 0] = np.nan
+        return values
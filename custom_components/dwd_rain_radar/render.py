@@ -0,0 +1,160 @@
+"""Render decoded radar crops to colour-mapped (animated) PNG images."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections import OrderedDict
+from collections.abc import Hashable
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Precipitation in mm/h from which a colour is used
+RAIN_LEVELS = [0.1, 0.5, 1, 2, 5, 10, 20, 50, 100]
+
+TRANSPARENT_INDEX = 0
+MISSING_INDEX = 1
+MARKER_INDEX = 2
+RAIN_INDEX = 3
+
+PALETTE = [
+    (0, 0, 0),  # No rain, transparent
+    (128, 128, 128),  # Missing data
+    (255, 0, 0),  # Location marker
+    (191, 255, 255),
+    (0, 255, 255),
+    (0, 191, 255),
+    (0, 127, 255),
+    (0, 0, 255),
+    (127, 0, 255),
+    (255, 0, 255),
+    (255, 127, 0),
+    (255, 255, 0),
+]
+ALPHA = [0, 96, 255, *([255] * len(RAIN_LEVELS))]
+
+# Rain rates are quantized to LUT_STEP before the palette lookup
+LUT_STEP = 0.1
+LUT = np.searchsorted(
+    np.array(RAIN_LEVELS) / LUT_STEP,
+    np.arange(int(RAIN_LEVELS[-1] / LUT_STEP) + 1) + 0.5,
+).astype(np.uint8)
+LUT[LUT > 0] += RAIN_INDEX - 1
+
+FRAME_DELAY_MS = 500
+
+
+class FrameCache:
+    """LRU cache of compressed image data."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache."""
+        self._maxsize = maxsize
+        self._data: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    def get(self, key: Hashable) -> bytes | None:
+        """Return the cached data and mark it as recently used."""
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        """Store data, evicting the least recently used entry when full."""
+        self._data[key] = data
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+def compress_frame(values: np.ndarray, scale: float, size: tuple[int, int]) -> bytes:
+    """Colour map a crop and return the compressed PNG image data.
+
+    The crop is rows south to north as stored in RADOLAN files; `scale`
+    converts its values to mm/h and `size` is (width, height) in pixels.
+    """
+    width, height = size
+
+    quantized = np.rint(np.nan_to_num(values, nan=0.0) * (scale / LUT_STEP))
+    indices = LUT[np.clip(quantized, 0, len(LUT) - 1).astype(np.intp)]
+    indices[np.isnan(values)] = MISSING_INDEX
+
+    # North up
+    indices = indices[::-1]
+
+    # Nearest neighbour resize
+    rows = np.arange(height) * indices.shape[0] // height
+    cols = np.arange(width) * indices.shape[1] // width
+    image = indices[rows[:, None], cols[None, :]]
+
+    # Mark the location in the center
+    marker = max(min(width, height) // 100, 1)
+    image[
+        height // 2 - marker:height // 2 + marker + 1,
+        width // 2 - marker:width // 2 + marker + 1,
+    ] = MARKER_INDEX
+
+    # Every scanline is prefixed with filter type 0
+    scanlines = np.zeros((height, width + 1), dtype=np.uint8)
+    scanlines[:, 1:] = image
+
+    return zlib.compress(scanlines.tobytes())
+
+
+def encode_png(data: bytes, size: tuple[int, int]) -> bytes:
+    """Return a PNG image from compressed image data."""
+    return b''.join([
+        PNG_SIGNATURE,
+        _header_chunks(size),
+        _chunk(b'IDAT', data),
+        _chunk(b'IEND', b''),
+    ])
+
+
+def encode_apng(frames: list[bytes], size: tuple[int, int]) -> bytes:
+    """Return an endlessly looping animated PNG from compressed image data."""
+    width, height = size
+    chunks = [
+        PNG_SIGNATURE,
+        _header_chunks(size),
+        _chunk(b'acTL', struct.pack('>II', len(frames), 0)),
+    ]
+
+    sequence = 0
+    for index, data in enumerate(frames):
+        chunks.append(_chunk(b'fcTL', struct.pack(
+            '>IIIIIHHBB', sequence, width, height, 0, 0, FRAME_DELAY_MS, 1000, 0, 0
+        )))
+        sequence += 1
+
+        if index == 0:
+            chunks.append(_chunk(b'IDAT', data))
+        else:
+            chunks.append(_chunk(b'fdAT', struct.pack('>I', sequence) + data))
+            sequence += 1
+
+    chunks.append(_chunk(b'IEND', b''))
+
+    return b''.join(chunks)
+
+
+def _header_chunks(size: tuple[int, int]) -> bytes:
+    """Return the IHDR, PLTE and tRNS chunks of an 8 bit palette image."""
+    width, height = size
+    return b''.join([
+        _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)),
+        _chunk(b'PLTE', bytes(channel for color in PALETTE for channel in color)),
+        _chunk(b'tRNS', bytes(ALPHA)),
+    ])
+
+
+def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Return a PNG chunk."""
+    return (
+        struct.pack('>I', len(data))
+        + chunk_type
+        + data
+        + struct.pack('>I', zlib.crc32(chunk_type + data))
+    )
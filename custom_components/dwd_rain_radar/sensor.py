@@ -19,12 +19,16 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 
-from .const import DOMAIN, ATTRIBUTION, FORECAST_MINUTES
+from .const import (
+    DOMAIN, ATTRIBUTION, CONF_EXTRAPOLATION, CONF_OBSERVED_PRODUCT, CONF_STATISTICS, FORECAST_MINUTES,
+    EXTRAPOLATION_MINUTES,
+)
 from homeassistant.const import (
     ATTR_ATTRIBUTION
 )
-from .coordinator import DwdRainRadarUpdateCoordinator, PrecipitationForecast
-from .entity import DwdCoordinatorEntity
+from .coordinator import DwdRainRadarUpdateCoordinator, PrecipitationSeries
+from .entity import DwdCoordinatorEntity, VOLATILE_ATTRIBUTES
+from .products import OBSERVED_PRODUCTS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,8 +37,9 @@ _LOGGER = logging.getLogger(__name__)
 class PrecipitationSensorEntityDescription(SensorEntityDescription):
     """Provide a description for a precipitation sensor."""
 
-    value_fn: Callable[[PrecipitationForecast]]
-    extra_state_attributes_fn: Callable[[PrecipitationForecast], dict] = lambda _: {}
+    value_fn: Callable[[PrecipitationSeries]]
+    data_fn: Callable[[DwdRainRadarUpdateCoordinator], PrecipitationSeries] = lambda coordinator: coordinator.data
+    extra_state_attributes_fn: Callable[[PrecipitationSeries], dict] = lambda _: {}
     exists_fn: Callable[[dict], bool] = lambda _: True
 
 
@@ -46,14 +51,14 @@ PRECIPTITATION_SENSORS = [
         device_class=SensorDeviceClass.PRECIPITATION,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda forecasts: next(
-            (forecast.precipitation for forecast in forecasts if
-             forecast.prediction_time > datetime.now().astimezone() - timedelta(minutes=5)),
+            (forecast.precipitation for forecast in
+             forecasts.after(datetime.now().astimezone() - timedelta(minutes=5))),
             None
         ),
         extra_state_attributes_fn=lambda forecasts: {
             'prediction_time': next(
-                (forecast.prediction_time for forecast in forecasts if
-                 forecast.prediction_time > datetime.now().astimezone() - timedelta(minutes=5)),
+                (forecast.prediction_time for forecast in
+                 forecasts.after(datetime.now().astimezone() - timedelta(minutes=5))),
                 None
             )
         },
@@ -66,32 +71,48 @@ PRECIPTITATION_SENSORS = [
         device_class=SensorDeviceClass.PRECIPITATION,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda forecasts, forecast_in=forecast_in: next(
-            (forecast.precipitation for forecast in forecasts if
-             forecast.prediction_time > datetime.now().astimezone() + timedelta(minutes=forecast_in - 5)),
+            (forecast.precipitation for forecast in
+             forecasts.after(datetime.now().astimezone() + timedelta(minutes=forecast_in - 5))),
             None
         ),
         extra_state_attributes_fn=lambda forecasts, forecast_in=forecast_in: {
             'prediction_time': next(
-                (forecast.prediction_time for forecast in forecasts if
-                 forecast.prediction_time > datetime.now().astimezone() + timedelta(minutes=forecast_in - 5)),
+                (forecast.prediction_time for forecast in
+                 forecasts.after(datetime.now().astimezone() + timedelta(minutes=forecast_in - 5))),
                 None
             )
         },
-    ) for forecast_in in FORECAST_MINUTES),
+        exists_fn=lambda entry, forecast_in=forecast_in: (
+            forecast_in in FORECAST_MINUTES or entry.options.get(CONF_EXTRAPOLATION, False)
+        ),
+    ) for forecast_in in FORECAST_MINUTES + EXTRAPOLATION_MINUTES),
+    PrecipitationSensorEntityDescription(
+        key="observed_precipitation",
+        name="Observed Precipitation",
+        native_unit_of_measurement=UnitOfPrecipitationDepth.MILLIMETERS,
+        device_class=SensorDeviceClass.PRECIPITATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        data_fn=lambda coordinator: coordinator.observed,
+        value_fn=lambda observed: next((forecast.precipitation for forecast in observed[-1:]), None),
+        extra_state_attributes_fn=lambda observed: {
+            'observation_time': next((forecast.prediction_time for forecast in observed[-1:]), None)
+        },
+        exists_fn=lambda entry: entry.options.get(CONF_OBSERVED_PRODUCT) in OBSERVED_PRODUCTS,
+    ),
     PrecipitationSensorEntityDescription(
         key="rain_expected_at",
         name="Rain Expected At",
         entity_registry_enabled_default=False,
         device_class=SensorDeviceClass.DATE,
         value_fn=lambda forecasts: next(
-            (forecast.prediction_time for forecast in forecasts if
-             forecast.precipitation > 0 and forecast.prediction_time > datetime.now().astimezone()),
+            (forecast.prediction_time for forecast in
+             forecasts.rain_after(datetime.now().astimezone())),
             None
         ),
         extra_state_attributes_fn=lambda forecasts: {
             'precipitation': next(
-                (forecast.precipitation for forecast in forecasts if
-                 forecast.precipitation > 0 and forecast.prediction_time > datetime.now().astimezone()),
+                (forecast.precipitation for forecast in
+                 forecasts.rain_after(datetime.now().astimezone())),
                 None
             )
         },
@@ -102,13 +123,13 @@ PRECIPTITATION_SENSORS = [
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda forecasts: next(
             (int((forecast.prediction_time - datetime.now().astimezone()).total_seconds() // 60) for forecast in
-             forecasts if forecast.precipitation > 0 and forecast.prediction_time > datetime.now().astimezone()),
+             forecasts.rain_after(datetime.now().astimezone())),
             None
         ),
         extra_state_attributes_fn=lambda forecasts: {
             'precipitation': next(
-                (forecast.precipitation for forecast in forecasts if
-                 forecast.precipitation > 0 and forecast.prediction_time > datetime.now().astimezone()),
+                (forecast.precipitation for forecast in
+                 forecasts.rain_after(datetime.now().astimezone())),
                 None
             )
         },
@@ -123,8 +144,12 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_class = (
+        UnrecordedPrecipitationSensorEntity if entry.options.get(CONF_STATISTICS, False)
+        else PrecipitationSensorEntity
+    )
     async_add_entities(
-        PrecipitationSensorEntity(coordinator, description)
+        entity_class(coordinator, description)
         for description in PRECIPTITATION_SENSORS
         if description.exists_fn(entry)
     )
@@ -149,14 +174,22 @@ class PrecipitationSensorEntity(DwdCoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.entity_description.value_fn(self.coordinator.data)
+        return self.entity_description.value_fn(self.entity_description.data_fn(self.coordinator))
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes of the device."""
-        attributes = self.entity_description.extra_state_attributes_fn(self.coordinator.data)
+        attributes = self.entity_description.extra_state_attributes_fn(
+            self.entity_description.data_fn(self.coordinator)
+        )
 
         attributes['latest_update'] = self.coordinator.latest_update
         attributes[ATTR_ATTRIBUTION] = ATTRIBUTION
 
         return attributes
+
+
+class UnrecordedPrecipitationSensorEntity(PrecipitationSensorEntity):
+    """Precipitation sensor not recording volatile attributes."""
+
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
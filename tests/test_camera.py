@@ -0,0 +1,115 @@
+"""Test camera for DWD rain radar integration."""
+import os
+import struct
+import time
+import zlib
+
+import pytest
+from unittest.mock import AsyncMock, patch, MagicMock
+
+from freezegun import freeze_time
+from homeassistant.components.camera import async_get_image
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from typing_extensions import Generator
+
+from custom_components.dwd_rain_radar import render
+from custom_components.dwd_rain_radar.const import DOMAIN
+
+
+
+
+@pytest.fixture
+def entity_registry_enabled_by_default() -> Generator[None]:
+    """Test fixture that ensures all entities are enabled in the registry."""
+    with patch(
+            "homeassistant.helpers.entity.Entity.entity_registry_enabled_default",
+            return_value=True,
+    ):
+        yield
+
+@pytest.fixture(autouse=True)
+def set_timezone():
+    os.environ['TZ'] = 'Europe/Berlin'  # Set to your desired timezone
+    time.tzset()  # Apply the timezone setting
+
+    yield  # Run the test
+
+    # Cleanup after the test
+    del os.environ['TZ']
+    time.tzset()
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_camera(mock_get, hass, enable_custom_integrations, entity_registry_enabled_by_default):
+    """Test camera."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        binary_data = f.read()
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.read = MagicMock(return_value=binary_data)
+
+    mock_get.return_value = mock_response
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    }, options={
+        "radar_radius": 20,
+    })
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("camera.mock_title_radar")
+
+    with patch(
+            "custom_components.dwd_rain_radar.camera.compress_frame",
+            wraps=render.compress_frame,
+    ) as compress_frame:
+        image = await async_get_image(hass, "camera.mock_title_radar")
+
+        assert image.content_type == "image/png"
+        assert image.content.startswith(render.PNG_SIGNATURE)
+        assert struct.unpack('>II', image.content[16:24]) == (41 * 4, 41 * 4)
+        assert compress_frame.call_count == 1
+
+        # Served from the cache
+        assert (await async_get_image(hass, "camera.mock_title_radar")).content == image.content
+        assert compress_frame.call_count == 1
+
+        loop = await async_get_image(hass, "camera.mock_title_radar_loop", width=100, height=100)
+
+        assert b'acTL' in loop.content
+        assert struct.unpack('>I', loop.content[loop.content.index(b'acTL') + 4:][:4]) == (25,)
+        assert compress_frame.call_count == 1 + 25
+
+        # The next run repeats the valid times of this one, but must not be served from the cache
+        location = hass.data[DOMAIN][entry.entry_id].location
+        location.frames = [(timestamp, values + 1) for timestamp, values in location.frames[1:]]
+
+        next_loop = await async_get_image(hass, "camera.mock_title_radar_loop", width=100, height=100)
+
+        assert compress_frame.call_count == 1 + 25 + 24
+        assert next_loop.content != loop.content
+
+def test_compress_frame():
+    """Test colour mapping of a crop."""
+
+    values = render.np.array([
+        [0.0, 0.01],
+        [render.np.nan, 1.0],
+    ], dtype=render.np.float32)
+
+    image = zlib.decompress(render.compress_frame(values, 12, (200, 200)))
+    scanlines = [image[row * 201:(row + 1) * 201] for row in range(200)]
+
+    # North up: the second row of the crop is rendered first
+    assert scanlines[0] == bytes([0] + [render.MISSING_INDEX] * 100 + [8] * 100)
+    assert scanlines[199] == bytes([0] + [render.TRANSPARENT_INDEX] * 100 + [3] * 100)
+    assert scanlines[100][99:104] == bytes([render.MARKER_INDEX] * 5)
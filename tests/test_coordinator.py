@@ -0,0 +1,37 @@
+"""Test coordinator for DWD rain radar integration."""
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from custom_components.dwd_rain_radar.coordinator import PrecipitationForecast, PrecipitationSeries
+
+
+def test_precipitation_series():
+    """Test the array backed precipitation series."""
+
+    start = int(datetime(2024, 8, 8, 15, 50, tzinfo=timezone.utc).timestamp())
+    series = PrecipitationSeries.from_radolan_data((
+        np.array([start + 600, start, start + 300, start + 900], dtype=np.int64),
+        np.array([0.01, 0.07, np.nan, 0.0], dtype=np.float32),
+    ), 12)
+
+    assert len(series) == 4
+    assert series[0] == PrecipitationForecast(
+        precipitation=0.84,
+        prediction_time=datetime(2024, 8, 8, 15, 50, tzinfo=timezone.utc).astimezone(),
+    )
+    assert series[1].precipitation is None
+    assert [forecast.precipitation for forecast in series] == [0.84, None, 0.12, 0.0]
+
+    later = series.after(datetime(2024, 8, 8, 15, 50, tzinfo=timezone.utc))
+    assert isinstance(later, PrecipitationSeries)
+    assert len(later) == 3
+    assert np.shares_memory(later.values, series.values)
+
+    rain = series.rain_after(datetime(2024, 8, 8, 15, 50, tzinfo=timezone.utc))
+    assert rain[0].prediction_time == datetime(2024, 8, 8, 16, 0, tzinfo=timezone.utc)
+    assert len(series.rain_after(datetime(2024, 8, 8, 16, 0, tzinfo=timezone.utc))) == 0
+
+    with pytest.raises(ValueError):
+        series.values[0] = 1
@@ -0,0 +1,88 @@
+"""Test parallel bz2 decompression for DWD rain radar integration."""
+import bz2
+import io
+import os
+import tarfile
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.dwd_rain_radar import decompress
+
+
+@pytest.fixture
+def archive() -> bytes:
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        return f.read()
+
+def _members(tar: tarfile.TarFile) -> list:
+    return [(tarinfo.name, tar.extractfile(tarinfo).read()) for tarinfo in tar if tarinfo.isreg()]
+
+def test_split_blocks(archive):
+    """Test a single stream is split into streams of one block each."""
+
+    streams = decompress._split(archive)
+
+    assert len(streams) > 1
+    assert b"".join(bz2.decompress(stream) for stream in streams) == bz2.decompress(archive)
+
+def test_split_streams(archive):
+    """Test concatenated streams as written by parallel compressors are split at stream boundaries."""
+
+    data = bz2.decompress(archive)[:3_000_000]
+    multi_stream = b"".join(bz2.compress(data[start:start + 900_000]) for start in range(0, len(data), 900_000))
+
+    streams = decompress._split(multi_stream)
+
+    assert len(streams) == -(-len(data) // 900_000)
+    assert b"".join(bz2.decompress(stream) for stream in streams) == data
+
+@patch("os.cpu_count", return_value=4)
+def test_open_tar(mock_cpu_count, archive):
+    """Test the parallel path yields the same tar members as the streaming path."""
+
+    with patch("bz2.decompress", wraps=bz2.decompress) as mock_decompress:
+        members = _members(decompress.open_tar(archive))
+
+    assert mock_decompress.call_count > 1
+    assert members == _members(tarfile.open(fileobj=io.BytesIO(archive), mode="r:bz2"))
+
+@patch("os.cpu_count", return_value=4)
+def test_open_tar_memory(mock_cpu_count, archive):
+    """Test only a window of blocks is decompressed ahead of the reader."""
+
+    block_size = max(len(bz2.decompress(stream)) for stream in decompress._split(archive))
+
+    tracemalloc.start()
+    try:
+        tar = decompress.open_tar(archive)
+        for tarinfo in tar:
+            if tarinfo.isreg():
+                tar.extractfile(tarinfo).read(1000)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A block in flight per worker and the block being read, each briefly held twice by the decompressor
+    assert peak < 2 * (4 + 1) * block_size + 1_000_000
+    assert peak < len(bz2.decompress(archive)) / 2
+
+@patch("os.cpu_count", return_value=4)
+def test_open_tar_fallback(mock_cpu_count, archive):
+    """Test an archive with wrong block boundaries falls back to the streaming path."""
+
+    with patch.object(decompress, "_split", side_effect=ValueError("Combined CRC mismatch")):
+        tar = decompress.open_tar(archive)
+
+    assert len(_members(tar)) == 25
+
+@patch("os.cpu_count", return_value=1)
+def test_open_tar_single_core(mock_cpu_count, archive):
+    """Test a single core host uses the streaming path."""
+
+    with patch.object(decompress, "_split") as mock_split:
+        tar = decompress.open_tar(archive)
+
+    mock_split.assert_not_called()
+    assert len(_members(tar)) == 25
@@ -0,0 +1,129 @@
+"""Test motion-vector extrapolation for DWD rain radar integration."""
+import os
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch, MagicMock
+
+from freezegun import freeze_time
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from typing_extensions import Generator
+
+from custom_components.dwd_rain_radar.const import DOMAIN
+from custom_components.dwd_rain_radar.extrapolation import estimate_motion, extrapolate
+
+
+
+
+@pytest.fixture
+def entity_registry_enabled_by_default() -> Generator[None]:
+    """Test fixture that ensures all entities are enabled in the registry."""
+    with patch(
+            "homeassistant.helpers.entity.Entity.entity_registry_enabled_default",
+            return_value=True,
+    ):
+        yield
+
+@pytest.fixture(autouse=True)
+def set_timezone():
+    os.environ['TZ'] = 'Europe/Berlin'  # Set to your desired timezone
+    time.tzset()  # Apply the timezone setting
+
+    yield  # Run the test
+
+    # Cleanup after the test
+    del os.environ['TZ']
+    time.tzset()
+
+def test_estimate_motion():
+    """Test the motion of a shifted rain field is recovered."""
+
+    rng = np.random.default_rng(1)
+    field = (rng.random((160, 160)) > 0.6) * rng.random((160, 160)) * 5
+
+    # Move 2 cells south and 1 cell west every interval
+    frames = [
+        np.roll(field, (2 * step, -step), axis=(0, 1))[16:145, 16:145].astype(np.float32)
+        for step in range(8)
+    ]
+
+    motion = estimate_motion(frames)
+
+    assert motion.shape == (2, 129, 129)
+    assert motion[0].mean() == pytest.approx(2, abs=0.1)
+    assert motion[1].mean() == pytest.approx(-1, abs=0.1)
+
+    extrapolated = extrapolate(frames, 3)
+
+    assert len(extrapolated) == 3
+    np.testing.assert_array_equal(extrapolated[2][20:100, 20:100], frames[-1][14:94, 23:103])
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_extrapolated_sensor(mock_get, hass, enable_custom_integrations, entity_registry_enabled_by_default):
+    """Test sensors beyond the RV horizon."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        binary_data = f.read()
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.read = MagicMock(return_value=binary_data)
+
+    mock_get.return_value = mock_response
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    }, options={
+        "extrapolation": True,
+    })
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    precipitation_10_minutes = hass.states.get("sensor.mock_title_precipitation_in_10_minutes")
+    assert precipitation_10_minutes
+    assert precipitation_10_minutes.state == '0.12'
+
+    precipitation_180_minutes = hass.states.get("sensor.mock_title_precipitation_in_180_minutes")
+    assert precipitation_180_minutes
+    assert precipitation_180_minutes.attributes['prediction_time'].isoformat() == '2024-08-08T20:45:00+02:00'
+
+    raining_in_150_minutes = hass.states.get("binary_sensor.mock_title_raining_in_150_minutes")
+    assert raining_in_150_minutes
+    assert raining_in_150_minutes.attributes['prediction_time'].isoformat() == '2024-08-08T20:15:00+02:00'
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_extrapolation_disabled(mock_get, hass, enable_custom_integrations, entity_registry_enabled_by_default):
+    """Test sensors beyond the RV horizon only exist with extrapolation enabled."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        binary_data = f.read()
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.read = MagicMock(return_value=binary_data)
+
+    mock_get.return_value = mock_response
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    })
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.mock_title_precipitation_in_120_minutes")
+    assert hass.states.get("sensor.mock_title_precipitation_in_180_minutes") is None
@@ -0,0 +1,175 @@
+"""Test setup of the DWD rain radar integration."""
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from unittest.mock import AsyncMock, patch, MagicMock
+
+from freezegun import freeze_time
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from typing_extensions import Generator
+
+from custom_components.dwd_rain_radar.const import DATA_RADOLAN, DOMAIN
+
+
+
+
+@pytest.fixture
+def entity_registry_enabled_by_default() -> Generator[None]:
+    """Test fixture that ensures all entities are enabled in the registry."""
+    with patch(
+            "homeassistant.helpers.entity.Entity.entity_registry_enabled_default",
+            return_value=True,
+    ):
+        yield
+
+@pytest.fixture(autouse=True)
+def set_timezone():
+    os.environ['TZ'] = 'Europe/Berlin'  # Set to your desired timezone
+    time.tzset()  # Apply the timezone setting
+
+    yield  # Run the test
+
+    # Cleanup after the test
+    del os.environ['TZ']
+    time.tzset()
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_background_refresh(mock_get, hass, hass_storage, enable_custom_integrations, entity_registry_enabled_by_default):
+    """Test platforms are set up from the cache before the first download finished."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        binary_data = f.read()
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.read = MagicMock(return_value=binary_data)
+
+    download = asyncio.Event()
+
+    async def get(*args, **kwargs):
+        await download.wait()
+        return mock_response
+
+    mock_get.side_effect = get
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    }, options={
+        "background_refresh": True,
+    })
+
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": {
+            "forecasts": {
+                "timestamps": [1723132200, 1723132500],
+                "values": [0.36, None],
+            },
+            "latest_update": "2024-08-08T17:45:00",
+        },
+    }
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    precipitation = hass.states.get("sensor.mock_title_precipitation")
+    assert precipitation
+    assert precipitation.state == '0.36'
+    assert precipitation.attributes['prediction_time'].isoformat() == '2024-08-08T17:50:00+02:00'
+
+    updated = asyncio.Event()
+    hass.data[DOMAIN][entry.entry_id].async_add_listener(updated.set)
+
+    download.set()
+    await asyncio.wait_for(updated.wait(), 10)
+    await hass.async_block_till_done()
+
+    precipitation = hass.states.get("sensor.mock_title_precipitation")
+    assert precipitation.state == '0.84'
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_background_refresh_without_cache(mock_get, hass, enable_custom_integrations, entity_registry_enabled_by_default):
+    """Test platforms are set up without data before the first download finished."""
+
+    async def get(*args, **kwargs):
+        await asyncio.Event().wait()
+
+    mock_get.side_effect = get
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    }, options={
+        "background_refresh": True,
+    })
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    precipitation = hass.states.get("sensor.mock_title_precipitation")
+    assert precipitation
+    assert precipitation.state == 'unknown'
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_setup_retry(mock_get, hass, enable_custom_integrations):
+    """Test a failed first refresh does not leave its location registered."""
+
+    mock_get.side_effect = httpx.ConnectError("DWD is unreachable")
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    })
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert "rv" not in hass.data[DATA_RADOLAN]
+
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert "rv" not in hass.data[DATA_RADOLAN]
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        binary_data = f.read()
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.read = MagicMock(return_value=binary_data)
+
+    mock_get.side_effect = None
+    mock_get.return_value = mock_response
+
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert len(hass.data[DATA_RADOLAN]["rv"].locations) == 1
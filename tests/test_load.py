@@ -0,0 +1,233 @@
+"""Load test for DWD rain radar integration.
+
+Skipped unless DWD_LOAD_TEST_ENTRIES is set to a comma separated list of
+config entry counts, e.g. DWD_LOAD_TEST_ENTRIES=1,10,100,500 pytest -s tests/test_load.py
+"""
+import asyncio
+import hashlib
+import json
+import os
+import resource
+import socket
+import time
+from dataclasses import dataclass, asdict, replace
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.dwd_rain_radar.const import DATA_RADOLAN, DOMAIN
+from custom_components.dwd_rain_radar.products import FORECAST_PRODUCT, PRODUCTS
+
+ENTRY_COUNTS = [
+    int(count) for count in os.environ.get("DWD_LOAD_TEST_ENTRIES", "").split(",") if count.strip()
+]
+
+# Regression budgets, overridable from the environment
+MAX_LOOP_LAG = float(os.environ.get("DWD_LOAD_TEST_MAX_LOOP_LAG", "0.5"))
+# The download and decode are shared, so a cycle gets a fixed CPU budget plus a little per entry
+MAX_CPU_PER_CYCLE = float(os.environ.get("DWD_LOAD_TEST_MAX_CPU_PER_CYCLE", "2"))
+MAX_CPU_PER_ENTRY = float(os.environ.get("DWD_LOAD_TEST_MAX_CPU_PER_ENTRY", "0.005"))
+
+LOOP_LAG_INTERVAL = 0.01
+
+pytestmark = pytest.mark.skipif(not ENTRY_COUNTS, reason="DWD_LOAD_TEST_ENTRIES is not set")
+
+
+class RadarServer:
+    """Local stand-in for DWD OpenData serving the RV archive."""
+
+    def __init__(self, archive: bytes) -> None:
+        """Initialize the server."""
+        self.archive = archive
+        self.etag = f'"{hashlib.md5(archive).hexdigest()}"'
+        self.requests = 0
+        self.bytes_sent = 0
+        self._runner = None
+        self.url = None
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application()
+        app.router.add_get("/DE1200_RV_LATEST.tar.bz2", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        await web.SockSite(self._runner, sock).start()
+        self.url = f"http://127.0.0.1:{sock.getsockname()[1]}/DE1200_RV_LATEST.tar.bz2"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers={"ETag": self.etag})
+
+        self.bytes_sent += len(self.archive)
+        return web.Response(body=self.archive, headers={"ETag": self.etag})
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a sleeping task, and sample the resident memory."""
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.max_lag = 0.0
+        self.max_rss = _rss()
+        self._task = None
+
+    def __enter__(self) -> "LoopLagMonitor":
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._task.cancel()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.max_lag = max(self.max_lag, loop.time() - start - LOOP_LAG_INTERVAL)
+            self.max_rss = max(self.max_rss, _rss())
+
+
+def _rss() -> int:
+    """Return the current resident memory in bytes.
+
+    Unlike ru_maxrss, which is the high-water mark of the whole process,
+    this allows measuring the peak of a single cycle. Linux only.
+    """
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize()
+
+
+@dataclass
+class CycleReport:
+    """Resource usage of one update cycle of all config entries."""
+
+    entries: int
+    cycle: str
+    wall_time: float
+    cpu_time: float
+    max_loop_lag: float
+    peak_rss_mb: float
+    requests: int
+    bytes_fetched: int
+
+
+def _locations(count: int):
+    """Spread locations over the area covered by the RV composite."""
+    columns = max(int(count ** 0.5), 1)
+    for index in range(count):
+        row, column = divmod(index, columns)
+        yield (
+            47.5 + 7 * (row + 0.5) / (count / columns + 1),
+            6.0 + 8.5 * (column + 0.5) / columns,
+        )
+
+
+async def _measure_cycle(hass, server: RadarServer, coordinators, entries: int, cycle: str) -> CycleReport:
+    """Refresh all coordinators at once, like on an update interval tick."""
+    requests = server.requests
+    bytes_sent = server.bytes_sent
+
+    # Make the shared product sources due for a download
+    for radolan in hass.data[DATA_RADOLAN].values():
+        radolan._last_fetch = None
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+
+    with LoopLagMonitor() as monitor:
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+        await hass.async_block_till_done()
+
+    return CycleReport(
+        entries=entries,
+        cycle=cycle,
+        wall_time=round(time.perf_counter() - start_wall, 3),
+        cpu_time=round(time.process_time() - start_cpu, 3),
+        max_loop_lag=round(monitor.max_lag, 3),
+        peak_rss_mb=round(monitor.max_rss / 1024 / 1024, 1),
+        requests=server.requests - requests,
+        bytes_fetched=server.bytes_sent - bytes_sent,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("entries", ENTRY_COUNTS)
+async def test_load(entries, hass, enable_custom_integrations, socket_enabled):
+    """Set up many config entries against a local radar server and report resource usage per cycle."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        server = RadarServer(f.read())
+
+    await server.start()
+
+    try:
+        with patch.dict(PRODUCTS, {FORECAST_PRODUCT: replace(PRODUCTS[FORECAST_PRODUCT], url=server.url)}):
+            config_entries = []
+            for index, (latitude, longitude) in enumerate(_locations(entries)):
+                entry = MockConfigEntry(domain=DOMAIN, title=f"load {index}", data={
+                    "name": f"load {index}",
+                    "coordinates": {
+                        "latitude": latitude,
+                        "longitude": longitude
+                    }
+                })
+                entry.add_to_hass(hass)
+                config_entries.append(entry)
+
+            start = time.perf_counter()
+            with LoopLagMonitor() as monitor:
+                await asyncio.gather(*(
+                    hass.config_entries.async_setup(entry.entry_id) for entry in config_entries
+                ))
+                await hass.async_block_till_done()
+            _report({"entries": entries, "cycle": "setup", "wall_time": round(time.perf_counter() - start, 3),
+                     "max_loop_lag": round(monitor.max_lag, 3),
+                     "peak_rss_mb": round(monitor.max_rss / 1024 / 1024, 1), "requests": server.requests,
+                     "bytes_fetched": server.bytes_sent})
+
+            assert monitor.max_lag <= MAX_LOOP_LAG
+
+            coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in config_entries]
+            assert all(coordinator.last_update_success for coordinator in coordinators)
+
+            # Unchanged archive: the shared download must get away with a 304
+            not_modified = await _measure_cycle(hass, server, coordinators, entries, "not_modified")
+            _report(asdict(not_modified))
+
+            assert not_modified.requests == 1
+            assert not_modified.bytes_fetched == 0
+            assert not_modified.max_loop_lag <= MAX_LOOP_LAG
+            assert not_modified.cpu_time <= MAX_CPU_PER_CYCLE + entries * MAX_CPU_PER_ENTRY
+
+            # New archive: downloaded once and decoded for all coordinators
+            server.etag = f'"{time.time()}"'
+            modified = await _measure_cycle(hass, server, coordinators, entries, "modified")
+            _report(asdict(modified))
+
+            assert modified.bytes_fetched == len(server.archive)
+            assert modified.max_loop_lag <= MAX_LOOP_LAG
+            assert modified.cpu_time <= MAX_CPU_PER_CYCLE + entries * MAX_CPU_PER_ENTRY
+
+            for entry in config_entries:
+                assert await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await server.stop()
+
+
+def _report(report: dict) -> None:
+    """Print a report line, and append it to DWD_LOAD_TEST_REPORT if set."""
+    line = json.dumps(report)
+    print(line)
+
+    if path := os.environ.get("DWD_LOAD_TEST_REPORT"):
+        with open(path, "a") as f:
+            f.write(line + "\n")
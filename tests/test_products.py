@@ -0,0 +1,119 @@
+"""Test RADOLAN products for DWD rain radar integration."""
+import bz2
+import os
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch, MagicMock
+
+from freezegun import freeze_time
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.dwd_rain_radar.const import DOMAIN
+from custom_components.dwd_rain_radar.products import GRID_DE900, PRODUCTS
+
+
+@pytest.fixture(autouse=True)
+def set_timezone():
+    os.environ['TZ'] = 'Europe/Berlin'  # Set to your desired timezone
+    time.tzset()  # Apply the timezone setting
+
+    yield  # Run the test
+
+    # Cleanup after the test
+    del os.environ['TZ']
+    time.tzset()
+
+
+def _rw_file(values: np.ndarray) -> bytes:
+    """Return a bz2 compressed RW file of the given raw grid values."""
+    header = (
+        b"RW081450100000824BY1620235VS 3SW   2.28.1PR E-01INT  60GP 900x 900MF 00000001MS 10<asb,boo>"
+        + b"\x03"
+    )
+    return bz2.compress(header + values.astype('<u2').tobytes())
+
+
+def _mock_response(data: bytes) -> MagicMock:
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.read = MagicMock(return_value=data)
+    return mock_response
+
+
+def test_grid_coordinates():
+    """Test the lower left corner of the spherical grid."""
+
+    assert GRID_DE900.coordinates(46.9526, 3.5889) == (0, 0)
+
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_observed_sensor(mock_get, hass, enable_custom_integrations):
+    """Test the observed precipitation sensor next to the forecast."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        forecast_data = f.read()
+
+    # 1.3 mm/h in the cell of the location, missing data elsewhere
+    column, row = GRID_DE900.coordinates(48.07530, 11.32589)
+    values = np.full((900, 900), 0x2000, dtype=np.uint16)
+    values[row, column] = 13
+
+    responses = {
+        PRODUCTS["rv"].url: _mock_response(forecast_data),
+        PRODUCTS["rw"].url: _mock_response(_rw_file(values)),
+    }
+    mock_get.side_effect = lambda url, headers: responses[url]
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    }, options={
+        "observed_product": "rw",
+    })
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    observed = hass.states.get("sensor.mock_title_observed_precipitation")
+    assert observed
+    assert observed.state == '1.3'
+    assert observed.attributes['observation_time'].isoformat() == '2024-08-08T16:50:00+02:00'
+
+    precipitation = hass.states.get("sensor.mock_title_precipitation")
+    assert precipitation.state == '0.84'
+
+    assert mock_get.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_unknown_observed_product(mock_get, hass, enable_custom_integrations):
+    """Test an entry with an observed product no longer offered sets up without it."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        mock_get.return_value = _mock_response(f.read())
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    }, options={
+        "observed_product": "yw",
+    })
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.mock_title_precipitation").state == '0.84'
+    assert hass.states.get("sensor.mock_title_observed_precipitation") is None
+    assert mock_get.call_count == 1
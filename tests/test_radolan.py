@@ -0,0 +1,96 @@
+"""Test RADOLAN decoding for DWD rain radar integration."""
+import bz2
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+from custom_components.dwd_rain_radar.products import GRID_DE900, PRODUCTS
+from custom_components.dwd_rain_radar.radolan import Radolan
+
+
+def test_union_area():
+    """Test locations are decoded from one area covering all of them."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        data = f.read()
+
+    # Munich, Augsburg, and close to the eastern edge of the grid
+    locations = [(48.07530, 11.32589, 10), (48.37054, 10.89779, 5), (51.0, 17.3, 20)]
+
+    radolan = Radolan(PRODUCTS["rv"], None)
+    for latitude, longitude, radius in locations:
+        radolan.register(latitude, longitude, crop_radius=radius)
+
+    assert radolan._bounds(radolan.locations) == (610, 246, 1101, 655)
+
+    results = radolan._parse(data, radolan.locations)
+
+    for (latitude, longitude, radius), (timestamps, values, frames) in zip(locations, results):
+        alone = Radolan(PRODUCTS["rv"], None)
+        alone.register(latitude, longitude, crop_radius=radius)
+        [(alone_timestamps, alone_values, alone_frames)] = alone._parse(data, alone.locations)
+
+        np.testing.assert_array_equal(timestamps, alone_timestamps)
+        np.testing.assert_array_equal(values, alone_values)
+        for (_, crop), (_, alone_crop) in zip(frames, alone_frames):
+            assert crop.shape == (2 * radius + 1, 2 * radius + 1)
+            np.testing.assert_array_equal(crop, alone_crop)
+
+    # Only the crops are kept, not the area between the locations
+    for (_, _, radius), (_, _, frames) in zip(locations, results):
+        for _, crop in frames:
+            assert crop.base is None
+            assert crop.nbytes == (2 * radius + 1) ** 2 * 4
+
+    [_, _, (_, _, border_frames)] = results
+
+    # Cells beyond the grid are missing
+    assert np.isnan(border_frames[0][1][:, -1]).all()
+
+
+def test_parse_parallel():
+    """Test multi-core hosts decode the same crops from the streamed archive."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        data = f.read()
+
+    radolan = Radolan(PRODUCTS["rv"], None)
+    radolan.register(48.07530, 11.32589, crop_radius=10)
+    radolan.register(51.0, 17.3, crop_radius=20)
+
+    with patch("os.cpu_count", return_value=1):
+        expected = radolan._parse(data, radolan.locations)
+
+    with patch("os.cpu_count", return_value=4):
+        results = radolan._parse(data, radolan.locations)
+
+    for (timestamps, values, frames), (expected_timestamps, expected_values, expected_frames) in zip(
+            results, expected):
+        np.testing.assert_array_equal(timestamps, expected_timestamps)
+        np.testing.assert_array_equal(values, expected_values)
+        for (_, crop), (_, expected_crop) in zip(frames, expected_frames):
+            np.testing.assert_array_equal(crop, expected_crop)
+
+
+def test_location_outside_grid():
+    """Test a location outside the grid of a product is missing without failing the others."""
+
+    radolan = Radolan(PRODUCTS["ry"], None)
+    radolan.register(48.07530, 11.32589)
+
+    # Copenhagen is north of the national grid
+    radolan.register(55.68, 12.57)
+    assert radolan.locations[1].coord[1] >= GRID_DE900.rows
+
+    column, row = radolan.locations[0].coord
+    values = np.full((900, 900), 0x2000, dtype='<u2')
+    values[row, column] = 13
+    header = b"RY081545100000824BY1620235VS 3SW   2.28.1PR E-02INT   5GP 900x 900MF 00000001MS 10<asb,boo>\x03"
+
+    [(_, munich, _), (_, copenhagen, _)] = radolan._parse(
+        bz2.compress(header + values.tobytes()), radolan.locations
+    )
+
+    assert munich[0] == np.float32(0.13)
+    assert np.isnan(copenhagen[0])
@@ -0,0 +1,164 @@
+"""Test statistics for DWD rain radar integration."""
+import bz2
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch, MagicMock
+
+from freezegun import freeze_time
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.components.recorder.statistics import statistics_during_period
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import async_wait_recording_done
+
+from custom_components.dwd_rain_radar.const import DOMAIN
+from custom_components.dwd_rain_radar.products import GRID_DE900, PRODUCTS
+
+
+@pytest.fixture(autouse=True)
+def set_timezone():
+    os.environ['TZ'] = 'Europe/Berlin'  # Set to your desired timezone
+    time.tzset()  # Apply the timezone setting
+
+    yield  # Run the test
+
+    # Cleanup after the test
+    del os.environ['TZ']
+    time.tzset()
+
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+@freeze_time("2024-08-08T15:47:00", tz_offset=2)
+async def test_statistics(mock_get, recorder_mock, hass, enable_custom_integrations):
+    """Test forecasts are recorded as hourly statistics instead of state attributes."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        binary_data = f.read()
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.read = MagicMock(return_value=binary_data)
+
+    mock_get.return_value = mock_response
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    }, options={
+        "statistics": True,
+    })
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    precipitation = hass.states.get("sensor.mock_title_precipitation")
+    assert precipitation.state == '0.84'
+    assert 'prediction_time' in precipitation.attributes
+
+    # A refresh without a new archive does not import the statistics again
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    with patch(
+            "custom_components.dwd_rain_radar.coordinator.async_add_external_statistics"
+    ) as mock_add_statistics:
+        await coordinator.async_refresh()
+    mock_add_statistics.assert_not_called()
+
+    await async_wait_recording_done(hass)
+
+    statistic_id = f"{DOMAIN}:{entry.entry_id.lower()}_forecast"
+    start = datetime(2024, 8, 8, 15, tzinfo=timezone.utc)
+    statistics = await get_instance(hass).async_add_executor_job(
+        statistics_during_period, hass, start, None, {statistic_id}, "hour", None, {"mean", "min", "max"}
+    )
+
+    hours = statistics[statistic_id]
+    assert [datetime.fromtimestamp(hour["start"], timezone.utc).hour for hour in hours] == [15, 16, 17]
+    assert all(hour["min"] <= hour["mean"] <= hour["max"] for hour in hours)
+
+    states = await get_instance(hass).async_add_executor_job(
+        get_significant_states, hass, start, None, ["sensor.mock_title_precipitation"]
+    )
+    recorded = states["sensor.mock_title_precipitation"][-1]
+    assert recorded.state == '0.84'
+    assert 'prediction_time' not in recorded.attributes
+    assert 'latest_update' not in recorded.attributes
+
+
+def _ry_file(time: bytes, value: int) -> bytes:
+    """Return a bz2 compressed RY file with the raw value at the test location and missing data elsewhere."""
+    column, row = GRID_DE900.coordinates(48.07530, 11.32589)
+    values = np.full((900, 900), 0x2000, dtype='<u2')
+    values[row, column] = value
+
+    header = (
+        b"RY" + time + b"100000824BY1620235VS 3SW   2.28.1PR E-02INT   5GP 900x 900MF 00000001MS 10<asb,boo>"
+        + b"\x03"
+    )
+    return bz2.compress(header + values.tobytes())
+
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient.get', new_callable=AsyncMock)
+async def test_observed_statistics(mock_get, recorder_mock, hass, enable_custom_integrations):
+    """Test single frame archives of the same hour are aggregated into one hourly statistic."""
+
+    with open(os.path.dirname(__file__) + '/DE1200_RV_LATEST.tar.bz2', 'rb') as f:
+        binary_data = f.read()
+
+    responses = {}
+    for url in [PRODUCTS["rv"].url, PRODUCTS["ry"].url]:
+        responses[url] = MagicMock()
+        responses[url].status_code = 200
+    responses[PRODUCTS["rv"].url].read = MagicMock(return_value=binary_data)
+
+    # 1.2 mm/h at 15:45 UTC, then 2.4 mm/h at 15:50 UTC
+    responses[PRODUCTS["ry"].url].read = MagicMock(return_value=_ry_file(b"081545", 10))
+
+    mock_get.side_effect = lambda url, headers: responses[url]
+
+    entry = MockConfigEntry(domain=DOMAIN, data={
+        "name": "test dwd",
+        "coordinates": {
+            "latitude": 48.07530,
+            "longitude": 11.32589
+        }
+    }, options={
+        "statistics": True,
+        "observed_product": "ry",
+    })
+    entry.add_to_hass(hass)
+
+    with freeze_time("2024-08-08T15:47:00", tz_offset=2) as frozen:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert hass.states.get("sensor.mock_title_observed_precipitation").state == '1.2'
+
+        responses[PRODUCTS["ry"].url].read = MagicMock(return_value=_ry_file(b"081550", 20))
+        frozen.tick(300)
+        await hass.data[DOMAIN][entry.entry_id].async_refresh()
+        await hass.async_block_till_done()
+
+        assert hass.states.get("sensor.mock_title_observed_precipitation").state == '2.4'
+
+        await async_wait_recording_done(hass)
+
+        statistic_id = f"{DOMAIN}:{entry.entry_id.lower()}_observed"
+        statistics = await get_instance(hass).async_add_executor_job(
+            statistics_during_period, hass, datetime(2024, 8, 8, 15, tzinfo=timezone.utc), None,
+            {statistic_id}, "hour", None, {"mean", "min", "max"}
+        )
+
+    [hour] = statistics[statistic_id]
+    assert datetime.fromtimestamp(hour["start"], timezone.utc) == datetime(2024, 8, 8, 15, tzinfo=timezone.utc)
+    assert hour["mean"] == pytest.approx(1.8)
+    assert hour["min"] == pytest.approx(1.2)
+    assert hour["max"] == pytest.approx(2.4)